@@ -1,7 +1,10 @@
 import bpy
 import bmesh
 
+import os
+import random
 import sys
+import tempfile
 import unittest
 from io import StringIO
 
@@ -102,6 +105,90 @@ def select_link_face(obj, num_face):
             break
     return selected_face
 
+def create_asymmetric_grid(name, uv=True, shuffle=False,
+                           holes=((0, 0), (1, 1))):
+    # 4x3 grid without 2 faces, so that topology has no symmetry
+    verts = [(x, y, 0.0) for y in range(4) for x in range(5)]
+    faces = []
+    for y in range(3):
+        for x in range(4):
+            if (x, y) in holes:
+                continue
+            a = y * 5 + x
+            faces.append([a, a + 1, a + 6, a + 5])
+    # faces in different order, and loops start from different vertex
+    if shuffle:
+        rnd = random.Random(0)
+        rnd.shuffle(faces)
+        faces = [f[i:] + f[:i] for f, i
+                 in zip(faces, [rnd.randrange(4) for _ in faces])]
+
+    bm = bmesh.new()
+    bm_verts = [bm.verts.new(co) for co in verts]
+    for f in faces:
+        bm.faces.new([bm_verts[i] for i in f])
+    uv_layer = bm.loops.layers.uv.new("UVMap")
+    for f in bm.faces:
+        for l in f.loops:
+            if uv:
+                l[uv_layer].uv = (l.vert.co.x * 0.2, l.vert.co.y * 0.25)
+            else:
+                l[uv_layer].uv = (0.0, 0.0)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.objects.link(obj)
+    return obj
+
+def create_auv_grid(name, ragged=False, transpose=False):
+    # 4x3 grid whose vertices are not evenly spaced, UVs of the bottom row
+    # are selected. The top face of the last column is removed if ragged
+    xs = [0.0, 1.0, 1.5, 3.0, 3.2]
+    ys = [0.0, 0.5, 1.7, 2.0]
+    bm = bmesh.new()
+    bm_verts = []
+    for y in range(4):
+        for x in range(5):
+            co = (xs[x] + 0.05 * ((x * 3 + y) % 4), ys[y], 0.0)
+            if transpose:
+                co = (co[1], co[0], 0.0)
+            bm_verts.append(bm.verts.new(co))
+    for y in range(3):
+        for x in range(4):
+            if ragged and (x, y) == (3, 2):
+                continue
+            a = y * 5 + x
+            vs = [bm_verts[i] for i in (a, a + 1, a + 6, a + 5)]
+            bm.faces.new(vs[::-1] if transpose else vs)
+    uv_layer = bm.loops.layers.uv.new("UVMap")
+    for f in bm.faces:
+        for l in f.loops:
+            i = l.vert.index
+            l[uv_layer].uv = (l.vert.co.x * 0.2 + 0.01 * (i % 3),
+                              l.vert.co.y * 0.25 + 0.01 * (i % 5))
+            if transpose:
+                l[uv_layer].select = l.vert.co.x == 0.0
+            else:
+                l[uv_layer].select = l.vert.co.y == 0.0
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.objects.link(obj)
+    return obj
+
+def get_face_vert_uvs(obj):
+    # UV of each vertex of each face, faces are identified by vertices
+    mesh = obj.data
+    uv_layer = mesh.uv_layers.active
+    uvs = {}
+    for poly in mesh.polygons:
+        uvs[frozenset(poly.vertices)] = {
+            mesh.loops[i].vertex_index: tuple(uv_layer.data[i].uv)
+            for i in poly.loop_indices}
+    return uvs
+
 def add_face_select_history(obj, num_face, offset=0):
     bm = bmesh.from_edit_mesh(obj.data)
     bm.select_history.clear()
@@ -246,6 +333,7 @@ class TestUVMagicUV(TestBase):
         ('OPERATOR', 'uv.muv_uvinsp_display'),
         ('OPERATOR', 'uv.muv_uvinsp_select_overlapped'),
         ('OPERATOR', 'uv.muv_uvinsp_select_flipped'),
+        ('OPERATOR', 'uv.muv_uvinsp_coverage'),
 
         # UV Sculpt
         ('OPERATOR', 'uv.muv_uvsculpt_renderer'),
@@ -258,6 +346,9 @@ class TestUVMagicUV(TestBase):
 
     def setUp(self):
         bpy.ops.wm.open_mainfile(filepath=TESTEE_FILE)
+        # do not paste the clipboard shared by other sessions
+        prefs = bpy.context.user_preferences.addons["uv_magic_uv"].preferences
+        prefs.cpuv_clipboard_dir = tempfile.mkdtemp()
 
     def tearDown(self):
         pass
@@ -427,6 +518,88 @@ class TestUVMagicUV(TestBase):
         result = bpy.ops.object.muv_cpuv_obj_paste_uv()
         self.assertSetEqual(result, {'CANCELLED'})
 
+    def test_cpuv_topology(self):
+        print("======== Copy/Paste UV Coordinates (Faces in different order) ========")
+        src_obj = create_asymmetric_grid("Src")
+
+        def edit_mode(obj):
+            select_object_only(obj.name)
+            bpy.context.scene.objects.active = obj
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+
+        for flip in (False, True):
+            print("[TEST] (OK) Faces in different order (flip: %s)" % flip)
+            plain_obj = create_asymmetric_grid("Plain", uv=False)
+            shuffled_obj = create_asymmetric_grid("Shuffled", uv=False,
+                                                  shuffle=True)
+            edit_mode(src_obj)
+            result = bpy.ops.uv.muv_cpuv_copy_uv()
+            self.assertSetEqual(result, {'FINISHED'})
+            bpy.ops.object.mode_set(mode='OBJECT')
+            for obj in (plain_obj, shuffled_obj):
+                edit_mode(obj)
+                result = bpy.ops.uv.muv_cpuv_paste_uv(
+                    strategy='N_N', flip_copied_uv=flip, rotate_copied_uv=1)
+                self.assertSetEqual(result, {'FINISHED'})
+                bpy.ops.object.mode_set(mode='OBJECT')
+            self.assertDictEqual(get_face_vert_uvs(shuffled_obj),
+                                 get_face_vert_uvs(plain_obj))
+            if not flip:
+                self.assertNotEqual(get_face_vert_uvs(plain_obj),
+                                    get_face_vert_uvs(src_obj))
+
+        print("[TEST] (OK) Faces in different order (per object)")
+        shuffled_obj = create_asymmetric_grid("Shuffled", uv=False,
+                                              shuffle=True)
+        select_object_only(src_obj.name)
+        bpy.context.scene.objects.active = src_obj
+        result = bpy.ops.object.muv_cpuv_obj_copy_uv()
+        self.assertSetEqual(result, {'FINISHED'})
+        select_object_only(shuffled_obj.name)
+        bpy.context.scene.objects.active = shuffled_obj
+        result = bpy.ops.object.muv_cpuv_obj_paste_uv()
+        self.assertSetEqual(result, {'FINISHED'})
+        self.assertDictEqual(get_face_vert_uvs(shuffled_obj),
+                             get_face_vert_uvs(src_obj))
+
+        # faces symmetric in topology are matched by position
+        print("[TEST] (OK) Faces in different order (symmetric)")
+        src_obj = create_asymmetric_grid("SymSrc", holes=())
+        shuffled_obj = create_asymmetric_grid("SymShuffled", uv=False,
+                                              shuffle=True, holes=())
+        edit_mode(src_obj)
+        result = bpy.ops.uv.muv_cpuv_copy_uv()
+        self.assertSetEqual(result, {'FINISHED'})
+        bpy.ops.object.mode_set(mode='OBJECT')
+        edit_mode(shuffled_obj)
+        result = bpy.ops.uv.muv_cpuv_paste_uv(strategy='N_N')
+        self.assertSetEqual(result, {'FINISHED'})
+        bpy.ops.object.mode_set(mode='OBJECT')
+        self.assertDictEqual(get_face_vert_uvs(shuffled_obj),
+                             get_face_vert_uvs(src_obj))
+
+    def test_cpuv_default_dir(self):
+        print("======== Copy/Paste UV Coordinates (Default shared directory) ========")
+        from uv_magic_uv import common
+        obj_name = "Cube"
+
+        prefs = bpy.context.user_preferences.addons["uv_magic_uv"].preferences
+        prefs.cpuv_clipboard_dir = ""
+        select_object_only(obj_name)
+        bpy.context.scene.objects.active = bpy.data.objects[obj_name]
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.uv_texture_add()
+        bpy.ops.mesh.select_all(action='SELECT')
+
+        print("[TEST] (OK) Shared clipboard directory is not specified")
+        result = bpy.ops.uv.muv_cpuv_copy_uv()
+        self.assertSetEqual(result, {'FINISHED'})
+        filepath = common.get_uv_clipboard_filepath(bpy.context, "cpuv")
+        self.assertTrue(os.path.isfile(filepath))
+        result = bpy.ops.uv.muv_cpuv_paste_uv()
+        self.assertSetEqual(result, {'FINISHED'})
+
     def test_cpuv_selseq(self):
         print("======== Copy/Paste UV Coordinates (by selection sequence) ========")
         src_obj_name = "Cube"
@@ -1063,6 +1236,10 @@ class TestUVMagicUV(TestBase):
         result = bpy.ops.uv.muv_uvinsp_update()
         self.assertSetEqual(result, {'FINISHED'})
 
+        print("[TEST] (OK) Coverage")
+        result = bpy.ops.uv.muv_uvinsp_coverage(resolution=256)
+        self.assertSetEqual(result, {'FINISHED'})
+
         bpy.context.tool_settings.use_uv_select_sync = True
 
         print("[TEST] (OK) UV Select Sync = True")
@@ -1083,6 +1260,91 @@ class TestUVMagicUV(TestBase):
         result = bpy.ops.uv.muv_uvinsp_select_flipped()
         self.assertSetEqual(result, {'FINISHED'})
 
+    def test_uvinsp_same_island(self):
+        print("======== UV Inspection (same island) ========")
+        from uv_magic_uv.op import uv_inspection
+
+        # strip of 3 faces in one island, 2 is folded back over 0 and 1
+        strip_uvs = [[(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)],
+                     [(1.0, 0.0), (2.0, 0.0), (2.0, 1.0), (1.0, 1.0)],
+                     [(2.0, 0.0), (0.5, 0.0), (0.5, 1.0), (2.0, 1.0)]]
+        bm = bmesh.new()
+        uv_layer = bm.loops.layers.uv.new("UVMap")
+        verts = [[bm.verts.new((float(x), float(y), 0.0)) for y in range(2)]
+                 for x in range(4)]
+        for i, uvs in enumerate(strip_uvs):
+            f = bm.faces.new([verts[i][0], verts[i + 1][0], verts[i + 1][1],
+                              verts[i][1]])
+            for l, uv in zip(f.loops, uvs):
+                l[uv_layer].uv = uv
+        bm.faces.index_update()
+        faces = list(bm.faces)
+
+        print("[TEST] (OK) PART")
+        info = uv_inspection.get_overlapped_uv_info(bm, faces, uv_layer,
+                                                    'PART')
+        pairs = sorted(tuple(sorted((i["clip_face"].index,
+                                     i["subject_face"].index)))
+                       for i in info)
+        # 0-2 is overlapped, 1-2 shares UV edge
+        self.assertListEqual(pairs, [(0, 2)])
+        self.assertAlmostEqual(info[0]["area"], 0.5, places=5)
+        bm.free()
+
+    def test_uv_lint(self):
+        print("======== UV Lint ========")
+        sys.path.insert(0, os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "tools"))
+        import uv_lint
+
+        # 0-1 and 0-2 and 1-2 are overlapped, 3 is apart from others
+        rects = [(0.0, 0.0, 1.0, 1.0), (0.5, 0.0, 1.5, 1.0),
+                 (0.25, 0.25, 1.25, 0.75), (2.0, 0.0, 2.5, 0.5)]
+        bm = bmesh.new()
+        uv_layer = bm.loops.layers.uv.new("UVMap")
+        for i, (x0, y0, x1, y1) in enumerate(rects):
+            uvs = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+            f = bm.faces.new([bm.verts.new((i * 2.0 + u, v, 0.0))
+                              for u, v in ((0, 0), (1, 0), (1, 1), (0, 1))])
+            for l, uv in zip(f.loops, uvs):
+                l[uv_layer].uv = uv
+        mesh = bpy.data.meshes.new("UVLint")
+        bm.to_mesh(mesh)
+        bm.free()
+
+        print("[TEST] (OK) PART")
+        result = uv_lint.lint_mesh(mesh, 'PART')
+        self.assertEqual(result["num_overlapped"], 3)
+        self.assertListEqual(result["overlapped_faces"], [0, 1, 2])
+        self.assertAlmostEqual(result["overlapped_area"], 1.25, places=5)
+
+        print("[TEST] (OK) FACE")
+        result = uv_lint.lint_mesh(mesh, 'FACE')
+        self.assertEqual(result["num_overlapped"], 3)
+        self.assertListEqual(result["overlapped_faces"], [0, 1, 2])
+        self.assertAlmostEqual(result["overlapped_area"], 2.5, places=5)
+
+        # 1 is inside 0
+        rects = [(0.0, 0.0, 1.0, 1.0), (0.25, 0.25, 0.75, 0.75)]
+        bm = bmesh.new()
+        uv_layer = bm.loops.layers.uv.new("UVMap")
+        for i, (x0, y0, x1, y1) in enumerate(rects):
+            uvs = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+            f = bm.faces.new([bm.verts.new((i * 2.0 + u, v, 0.0))
+                              for u, v in ((0, 0), (1, 0), (1, 1), (0, 1))])
+            for l, uv in zip(f.loops, uvs):
+                l[uv_layer].uv = uv
+        mesh = bpy.data.meshes.new("UVLintContained")
+        bm.to_mesh(mesh)
+        bm.free()
+
+        print("[TEST] (OK) PART (contained)")
+        result = uv_lint.lint_mesh(mesh, 'PART')
+        self.assertEqual(result["num_overlapped"], 1)
+        self.assertListEqual(result["overlapped_faces"], [0, 1])
+        self.assertAlmostEqual(result["overlapped_area"], 0.25, places=5)
+
     def test_texwrap(self):
         print("======== Texture Wrap ========")
         obj_name = "Cube"
@@ -1174,6 +1436,73 @@ class TestUVMagicUV(TestBase):
     def test_auv(self):
         print("======== Align UV ========")
 
+    def test_auv_grid(self):
+        print("======== Align UV (Loop sequences in grid) ========")
+        from uv_magic_uv.op import align_uv
+
+        bpy.context.tool_settings.use_uv_select_sync = False
+        get_grid = align_uv.get_loop_seqs_grid
+        grids = []
+
+        def get_grid_recorded(uv_layer, loop_seqs):
+            grid = get_grid(uv_layer, loop_seqs)
+            grids.append(grid is not None)
+            return grid
+
+        def align(op, ragged, transpose, per_loop, **kwargs):
+            obj = create_auv_grid("AUV", ragged, transpose)
+            select_object_only(obj.name)
+            bpy.context.scene.objects.active = obj
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            if per_loop:
+                align_uv.get_loop_seqs_grid = lambda *_: None
+            else:
+                align_uv.get_loop_seqs_grid = get_grid_recorded
+            try:
+                result = op(transmission=True, **kwargs)
+            finally:
+                align_uv.get_loop_seqs_grid = get_grid
+            self.assertSetEqual(result, {'FINISHED'})
+            bpy.ops.object.mode_set(mode='OBJECT')
+            return get_face_vert_uvs(obj)
+
+        def assert_uvs_almost_equal(uvs1, uvs2):
+            self.assertSetEqual(set(uvs1.keys()), set(uvs2.keys()))
+            for f in uvs1:
+                for v, uv in uvs1[f].items():
+                    self.assertAlmostEqual(uv[0], uvs2[f][v][0], places=5)
+                    self.assertAlmostEqual(uv[1], uvs2[f][v][1], places=5)
+
+        ops = [("Straighten", bpy.ops.uv.muv_auv_straighten, False),
+               ("XY-Axis (X)", bpy.ops.uv.muv_auv_axis, False),
+               ("XY-Axis (Y)", bpy.ops.uv.muv_auv_axis, True)]
+        for name, op, transpose in ops:
+            for horizontal in (False, True):
+                for vertical in (False, True):
+                    print("[TEST] (OK) %s (horizontal: %s, vertical: %s)"
+                          % (name, horizontal, vertical))
+                    del grids[:]
+                    uvs = align(op, False, transpose, False,
+                                horizontal=horizontal, vertical=vertical)
+                    self.assertListEqual(grids, [True])
+                    expected = align(op, False, transpose, True,
+                                     horizontal=horizontal,
+                                     vertical=vertical)
+                    assert_uvs_almost_equal(uvs, expected)
+
+            # per-loop path does not support horizontal influence for the
+            # ragged sequence
+            for vertical in (False, True):
+                print("[TEST] (OK) %s ragged (vertical: %s)"
+                      % (name, vertical))
+                del grids[:]
+                uvs = align(op, True, transpose, False, vertical=vertical)
+                self.assertListEqual(grids, [False])
+                expected = align(op, True, transpose, True,
+                                 vertical=vertical)
+                assert_uvs_almost_equal(uvs, expected)
+
 
 if __name__ == "__main__":
     test_cases = [
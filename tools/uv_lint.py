@@ -0,0 +1,251 @@
+# <pep8-80 compliant>
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Check overlapped/flipped UVs of many .blend files in the background
+
+  python3 uv_lint.py --blender /path/to/blender -j 4 -o report.json *.blend
+
+Each .blend file is analyzed by its own "blender -b" process, and at most
+JOBS processes run at once. Report is written as JSON or CSV (decided by the
+extension of the output file) and has one entry per mesh object.
+overlapped_area is the area of overlapped regions in PART mode, and the UV
+area of overlapped faces (each face is counted once) in FACE mode.
+Exit code is 1 if any overlapped/flipped UV is found or any file fails.
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+__author__ = "Nutti <nutti.metro@gmail.com>"
+__status__ = "production"
+__version__ = "5.1"
+__date__ = "24 Feb 2018"
+
+
+CSV_FIELDS = [
+    "file", "object", "mesh", "uv_layer", "num_faces",
+    "num_overlapped", "overlapped_area", "overlapped_faces",
+    "num_flipped", "flipped_area", "flipped_faces", "error"
+]
+
+
+def lint_mesh(mesh, mode):
+    """
+    Analyze overlapped/flipped UVs of the mesh with UV Inspection
+    """
+
+    import bmesh
+    from uv_magic_uv import common
+    from uv_magic_uv.op import uv_inspection
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        uv_layer = bm.loops.layers.uv.active
+        if uv_layer is None:
+            return None
+        faces = list(bm.faces)
+
+        overlapped = uv_inspection.get_overlapped_uv_info(bm, faces,
+                                                          uv_layer, mode)
+        flipped = uv_inspection.get_flipped_uv_info(faces, uv_layer)
+
+        overlapped_faces = {}
+        overlapped_area = 0.0
+        for info in overlapped:
+            for f in (info["clip_face"], info["subject_face"]):
+                overlapped_faces[f.index] = f
+            # polygons are the whole subject face if one face contains
+            # the other, so the intersection area is used
+            if mode == 'PART':
+                overlapped_area += info["area"]
+        # whole face is overlapped, and face may be overlapped by many faces
+        if mode == 'FACE':
+            overlapped_area = sum(
+                (common.calc_polygon_2d_area([l[uv_layer].uv for l in f.loops])
+                 for f in overlapped_faces.values()), 0.0)
+        flipped_faces = [info["face"].index for info in flipped]
+        flipped_area = sum((common.calc_polygon_2d_area(info["uvs"])
+                           for info in flipped), 0.0)
+
+        return {
+            "uv_layer": uv_layer.name,
+            "num_faces": len(faces),
+            "num_overlapped": len(overlapped),
+            "overlapped_area": overlapped_area,
+            "overlapped_faces": sorted(overlapped_faces),
+            "num_flipped": len(flipped),
+            "flipped_area": flipped_area,
+            "flipped_faces": flipped_faces,
+        }
+    finally:
+        bm.free()
+
+
+def lint_current_file(mode):
+    """
+    Analyze all mesh objects in the current .blend file
+    """
+
+    import bpy
+
+    reports = []
+    results = {}    # mesh datablock shared by objects is analyzed once
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH':
+            continue
+        mesh = obj.data
+        if mesh.name not in results:
+            results[mesh.name] = lint_mesh(mesh, mode)
+        result = results[mesh.name]
+        if result is None:
+            continue
+        report = {"file": bpy.data.filepath, "object": obj.name,
+                  "mesh": mesh.name}
+        report.update(result)
+        reports.append(report)
+
+    return reports
+
+
+def run_worker(args):
+    """
+    Entry point in "blender -b" process
+    """
+
+    # use this repository's add-on if available, installed one otherwise
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.isdir(os.path.join(root, "uv_magic_uv")):
+        sys.path.insert(0, root)
+
+    reports = lint_current_file(args.mode)
+    with open(args.output, "w") as f:
+        json.dump(reports, f)
+
+
+def lint_file(blender, filepath, mode):
+    """
+    Analyze the .blend file in a new "blender -b" process
+    """
+
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [blender, "--factory-startup", "-b", filepath, "-noaudio",
+               "--python", os.path.abspath(__file__), "--",
+               "--worker", "--mode", mode, "-o", output]
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT)
+        try:
+            with open(output) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            log = proc.stdout.decode("utf-8", "replace").strip()
+            msg = "Failed to analyze (exit code: {}) {}".format(
+                proc.returncode, log.splitlines()[-1] if log else "")
+            return [{"file": filepath, "error": msg}]
+    finally:
+        os.remove(output)
+
+
+def write_report(reports, output):
+    if output.endswith(".csv"):
+        with open(output, "w", newline="") as f:
+            writer = csv.DictWriter(f, CSV_FIELDS)
+            writer.writeheader()
+            for r in reports:
+                row = dict(r)
+                for key in ("overlapped_faces", "flipped_faces"):
+                    if key in row:
+                        row[key] = " ".join(str(i) for i in row[key])
+                writer.writerow(row)
+    else:
+        with open(output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+def run_driver(args):
+    """
+    Entry point in the normal python process
+    """
+
+    reports = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [executor.submit(lint_file, args.blender, path, args.mode)
+                   for path in args.files]
+        for path, future in zip(args.files, futures):
+            result = future.result()
+            reports.extend(result)
+            for r in result:
+                if "error" in r:
+                    print("{}: {}".format(path, r["error"]))
+                elif r["num_overlapped"] or r["num_flipped"]:
+                    print("{}: {}: {} overlapped, {} flipped".format(
+                        path, r["object"], r["num_overlapped"],
+                        r["num_flipped"]))
+
+    write_report(reports, args.output)
+
+    failed = any("error" in r or r["num_overlapped"] or r["num_flipped"]
+                 for r in reports)
+    return 1 if failed else 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Check overlapped/flipped UVs of .blend files")
+    parser.add_argument("files", nargs="*", help=".blend files to check")
+    parser.add_argument("-o", "--output", default="uv_lint.json",
+                        help="report file (.json or .csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of blender processes run at once")
+    parser.add_argument("--blender", default="blender",
+                        help="path to blender executable")
+    parser.add_argument("--mode", default='PART', choices=['PART', 'FACE'],
+                        help="PART: overlapped region, FACE: whole face")
+    parser.add_argument("--worker", action="store_true",
+                        help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = sys.argv[1:]
+    # blender passes arguments for script after "--"
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    args = parse_args(argv)
+
+    if args.worker:
+        run_worker(args)
+        return 0
+
+    return run_driver(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
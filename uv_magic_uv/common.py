@@ -23,17 +23,29 @@ __status__ = "production"
 __version__ = "5.1"
 __date__ = "24 Feb 2018"
 
-from collections import defaultdict
+from collections import OrderedDict, deque
 from pprint import pprint
 from math import fabs, sqrt
+import hashlib
+import os
+import struct
+import time
 
 import bpy
 from mathutils import Vector
 import bmesh
+import numpy as np
 
 
 DEBUG = False
 
+UV_CLIPBOARD_MAGIC = b"MUVC"
+UV_CLIPBOARD_VERSION = 4
+# flags of UV clipboard file
+UV_CLIPBOARD_HAS_TOPOLOGY = 0x1
+# magic, version, flags, number of faces, number of loops, copied time
+UV_CLIPBOARD_HEADER = struct.Struct("<4sHHQQd")
+
 
 def debug_print(*s):
     """
@@ -91,101 +103,283 @@ def get_space(area_type, region_type, space_type):
     return (area, region, space)
 
 
-def __get_island_info(uv_layer, islands):
-    """
-    get information about each island
-    """
-
-    island_info = []
-    for isl in islands:
-        info = {}
-        max_uv = Vector((-10000000.0, -10000000.0))
-        min_uv = Vector((10000000.0, 10000000.0))
-        ave_uv = Vector((0.0, 0.0))
-        num_uv = 0
-        for face in isl:
-            n = 0
-            a = Vector((0.0, 0.0))
-            ma = Vector((-10000000.0, -10000000.0))
-            mi = Vector((10000000.0, 10000000.0))
-            for l in face['face'].loops:
-                uv = l[uv_layer].uv
-                ma.x = max(uv.x, ma.x)
-                ma.y = max(uv.y, ma.y)
-                mi.x = min(uv.x, mi.x)
-                mi.y = min(uv.y, mi.y)
-                a = a + uv
-                n = n + 1
-            ave_uv = ave_uv + a
-            num_uv = num_uv + n
-            a = a / n
-            max_uv.x = max(ma.x, max_uv.x)
-            max_uv.y = max(ma.y, max_uv.y)
-            min_uv.x = min(mi.x, min_uv.x)
-            min_uv.y = min(mi.y, min_uv.y)
-            face['max_uv'] = ma
-            face['min_uv'] = mi
-            face['ave_uv'] = a
-        ave_uv = ave_uv / num_uv
-
-        info['center'] = ave_uv
-        info['size'] = max_uv - min_uv
-        info['num_uv'] = num_uv
-        info['group'] = -1
-        info['faces'] = isl
-        info['max'] = max_uv
-        info['min'] = min_uv
-
-        island_info.append(info)
-
-    return island_info
-
-
-def __parse_island(bm, face_idx, faces_left, island,
-                   face_to_verts, vert_to_faces):
-    """
-    Parse island
-    """
-
-    if face_idx in faces_left:
-        faces_left.remove(face_idx)
-        island.append({'face': bm.faces[face_idx]})
-        for v in face_to_verts[face_idx]:
-            connected_faces = vert_to_faces[v]
-            if connected_faces:
-                for cf in connected_faces:
-                    __parse_island(bm, cf, faces_left, island, face_to_verts,
-                                   vert_to_faces)
-
-
-def __get_island(bm, face_to_verts, vert_to_faces):
-    """
-    Get island list
-    """
-
-    uv_island_lists = []
-    faces_left = set(face_to_verts.keys())
-    while faces_left:
-        current_island = []
-        face_idx = list(faces_left)[0]
-        __parse_island(bm, face_idx, faces_left, current_island,
-                       face_to_verts, vert_to_faces)
-        uv_island_lists.append(current_island)
-
-    return uv_island_lists
-
-
-def __create_vert_face_db(faces, uv_layer):
-    # create mesh database for all faces
-    face_to_verts = defaultdict(set)
-    vert_to_faces = defaultdict(set)
+class IslandSet:
+    """
+    UV islands stored as flat arrays
+     - face_*: per face (face_island, face_min, face_max, face_center)
+     - loop_island: per loop, in the order of faces' loops
+                    (equals to BMLoop.index if all faces are given)
+     - loop_uv_vert: per loop, ID of the UV vertex (UV coordinate + mesh
+                     vertex) which the loop refers
+     - island_*: per island (island_min, island_max, island_center,
+                             island_size, island_num_uv)
+    Faces of each island are listed in face order by island_faces(), and the
+    legacy dictionary of each island is created on first access
+    """
+
+    def __init__(self, uvs, sizes, face_island, loop_uv_vert):
+        self.faces = []
+        self.uvs = uvs
+        self.loop_uv_vert = loop_uv_vert
+        self.face_size = sizes
+        self.face_start = np.cumsum(sizes) - sizes
+        self.face_island = face_island
+        self.loop_island = np.repeat(face_island, sizes)
+        num_islands = int(face_island.max()) + 1 if len(face_island) else 0
+
+        # per face
+        if len(sizes):
+            self.face_min = np.minimum.reduceat(uvs, self.face_start, axis=0)
+            self.face_max = np.maximum.reduceat(uvs, self.face_start, axis=0)
+            face_sum = np.add.reduceat(uvs, self.face_start, axis=0)
+        else:
+            self.face_min = np.empty((0, 2))
+            self.face_max = np.empty((0, 2))
+            face_sum = np.empty((0, 2))
+        self.face_center = face_sum / sizes.reshape(-1, 1)
+
+        # faces sorted by island
+        self.__order = np.argsort(face_island, kind='mergesort')
+        counts = np.bincount(face_island, minlength=num_islands)
+        self.__offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        # per island
+        island_start = self.__offsets[:-1]
+        if num_islands:
+            self.island_min = np.minimum.reduceat(
+                self.face_min[self.__order], island_start, axis=0)
+            self.island_max = np.maximum.reduceat(
+                self.face_max[self.__order], island_start, axis=0)
+            island_sum = np.add.reduceat(
+                face_sum[self.__order], island_start, axis=0)
+        else:
+            self.island_min = np.empty((0, 2))
+            self.island_max = np.empty((0, 2))
+            island_sum = np.empty((0, 2))
+        self.island_num_uv = np.bincount(face_island, weights=sizes,
+                                         minlength=num_islands)
+        self.island_num_uv = self.island_num_uv.astype(np.int64)
+        self.island_center = island_sum / self.island_num_uv.reshape(-1, 1)
+        self.island_size = self.island_max - self.island_min
+
+        self.__legacy = [None] * num_islands
+
+    def bind(self, faces):
+        """
+        Get island set which shares arrays and refers to given faces
+        """
+
+        island_set = object.__new__(IslandSet)
+        island_set.__dict__.update(self.__dict__)
+        island_set.faces = faces
+        island_set.__legacy = [None] * len(self.__legacy)
+        return island_set
+
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for v in self.__dict__.values()
+                   if isinstance(v, np.ndarray))
+
+    @property
+    def num_islands(self):
+        return len(self.__legacy)
+
+    def uv_edge_face_pairs(self):
+        """
+        Get pairs (i < j) of faces which share the UV edge
+        """
+
+        num_loops = len(self.loop_uv_vert)
+        if num_loops == 0:
+            return np.empty((0, 2), dtype=np.int64)
+
+        # UV edge is identified by the pair of UV vertex IDs
+        next_loop = np.arange(1, num_loops + 1)
+        next_loop[self.face_start + self.face_size - 1] = self.face_start
+        v1 = self.loop_uv_vert
+        v2 = self.loop_uv_vert[next_loop]
+        edge = np.minimum(v1, v2) * num_loops + np.maximum(v1, v2)
+
+        # faces which have the same UV edge are adjacent after sorting
+        order = np.argsort(edge, kind='mergesort')
+        loop_face = np.repeat(np.arange(len(self.face_size)), self.face_size)
+        edge = edge[order]
+        loop_face = loop_face[order]
+        shared = np.nonzero((edge[1:] == edge[:-1]) &
+                            (loop_face[1:] != loop_face[:-1]))[0]
+        f1 = loop_face[shared]
+        f2 = loop_face[shared + 1]
+
+        return np.stack((np.minimum(f1, f2), np.maximum(f1, f2)), axis=1)
+
+    def island_faces(self, isl):
+        """
+        Get indices of faces in the island
+        """
+
+        return self.__order[self.__offsets[isl]:self.__offsets[isl + 1]]
+
+    def __len__(self):
+        return len(self.__legacy)
+
+    def __iter__(self):
+        for i in range(len(self.__legacy)):
+            yield self[i]
+
+    def __getitem__(self, isl):
+        if isinstance(isl, slice):
+            return [self[i] for i in range(*isl.indices(len(self)))]
+        if isl < 0:
+            isl = isl + len(self)
+        if self.__legacy[isl] is None:
+            self.__legacy[isl] = self.__get_legacy_info(isl)
+        return self.__legacy[isl]
+
+    def __get_legacy_info(self, isl):
+        faces = []
+        for fidx in self.island_faces(isl).tolist():
+            faces.append({
+                'face': self.faces[fidx],
+                'max_uv': Vector(self.face_max[fidx]),
+                'min_uv': Vector(self.face_min[fidx]),
+                'ave_uv': Vector(self.face_center[fidx]),
+            })
+
+        return {
+            'center': Vector(self.island_center[isl]),
+            'size': Vector(self.island_size[isl]),
+            'num_uv': int(self.island_num_uv[isl]),
+            'group': -1,
+            'faces': faces,
+            'max': Vector(self.island_max[isl]),
+            'min': Vector(self.island_min[isl]),
+        }
+
+
+class IslandCache:
+    """
+    LRU cache of UV island detection results
+    Results are keyed by UV layer and the digest of UV/topology
+    """
+
+    def __init__(self, max_entries=16, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        self.__entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        if key in self.__entries:
+            self.__bytes = self.__bytes - self.__entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.__entries[key] = (value, size)
+        self.__bytes = self.__bytes + size
+        while (len(self.__entries) > self.max_entries or
+               self.__bytes > self.max_bytes):
+            _, (_, s) = self.__entries.popitem(last=False)
+            self.__bytes = self.__bytes - s
+
+    def clear(self):
+        self.__entries.clear()
+        self.__bytes = 0
+
+
+island_cache = IslandCache()
+
+
+def __get_uv_snapshot(faces, uv_layer):
+    """
+    Get flat arrays of loop UVs, mesh vertex indices and face sizes
+    """
+
+    uvs = []
+    verts = []
+    sizes = []
     for f in faces:
+        sizes.append(len(f.loops))
         for l in f.loops:
-            id_ = l[uv_layer].uv.to_tuple(5), l.vert.index
-            face_to_verts[f.index].add(id_)
-            vert_to_faces[id_].add(f.index)
+            uvs.extend(l[uv_layer].uv)
+            verts.append(l.vert.index)
+    uvs = np.array(uvs, dtype=np.float64).reshape(-1, 2)
+    verts = np.array(verts, dtype=np.int64)
+    sizes = np.array(sizes, dtype=np.int64)
+
+    return uvs, verts, sizes
 
-    return (face_to_verts, vert_to_faces)
+
+def __get_revision(uvs, verts, sizes):
+    """
+    Get digest of UV and topology of faces
+    Arrays gathered by __get_uv_snapshot are hashed as they are, so that
+    loops are walked only once
+    """
+
+    digest = hashlib.sha256()
+    digest.update(struct.pack("<QQ", len(sizes), len(verts)))
+    for a in (sizes, verts, uvs):
+        digest.update(np.ascontiguousarray(a).tobytes())
+
+    return digest.digest()
+
+
+def __get_island(uvs, verts, sizes):
+    """
+    Get island ID of each face and UV vertex ID of each loop
+    Faces which share the same UV vertex are merged by union-find, so the
+    islands are found in linear time without any recursion
+    """
+
+    num_faces = len(sizes)
+    if num_faces == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    loop_face = np.repeat(np.arange(num_faces, dtype=np.int64), sizes)
+
+    # assign ID to each UV vertex (UV coordinate + mesh vertex)
+    keys = np.empty((len(verts), 3), dtype=np.float64)
+    keys[:, 0:2] = np.round(uvs, 5) + 0.0
+    keys[:, 2] = verts
+    _, first_loop, loop_id = np.unique(keys, axis=0, return_index=True,
+                                       return_inverse=True)
+    loop_id = loop_id.reshape(-1)
+
+    # link each face to the first face which has the same UV vertex
+    link_face = loop_face[first_loop][loop_id]
+    linked = link_face != loop_face
+
+    # union-find (path halving, union by smaller index)
+    parent = list(range(num_faces))
+    for f1, f2 in zip(loop_face[linked].tolist(), link_face[linked].tolist()):
+        while parent[f1] != f1:
+            parent[f1] = parent[parent[f1]]
+            f1 = parent[f1]
+        while parent[f2] != f2:
+            parent[f2] = parent[parent[f2]]
+            f2 = parent[f2]
+        if f1 < f2:
+            parent[f2] = f1
+        elif f2 < f1:
+            parent[f1] = f2
+    roots = np.array(parent, dtype=np.int64)
+    while True:
+        grand = roots[roots]
+        if np.array_equal(grand, roots):
+            break
+        roots = grand
+
+    _, face_island = np.unique(roots, return_inverse=True)
+
+    return face_island.reshape(-1), loop_id
 
 
 def get_island_info(obj, only_selected=True):
@@ -193,10 +387,10 @@ def get_island_info(obj, only_selected=True):
     if check_version(2, 73, 0) >= 0:
         bm.faces.ensure_lookup_table()
 
-    return get_island_info_from_bmesh(bm, only_selected)
+    return get_island_info_from_bmesh(bm, only_selected, obj.data)
 
 
-def get_island_info_from_bmesh(bm, only_selected=True):
+def get_island_info_from_bmesh(bm, only_selected=True, mesh=None):
     if not bm.loops.layers.uv:
         return None
     uv_layer = bm.loops.layers.uv.verify()
@@ -207,17 +401,692 @@ def get_island_info_from_bmesh(bm, only_selected=True):
     else:
         selected_faces = [f for f in bm.faces]
 
-    return get_island_info_from_faces(bm, selected_faces, uv_layer)
+    return get_island_info_from_faces(bm, selected_faces, uv_layer, mesh)
+
+
+def get_island_info_from_faces(_, faces, uv_layer, mesh=None):
+    # island detection is skipped if UV/topology are not changed
+    # (mesh is 0 in the key if the faces are not owned by the mesh datablock)
+    uvs, verts, sizes = __get_uv_snapshot(faces, uv_layer)
+    mesh_ptr = mesh.as_pointer() if mesh is not None else 0
+    key = (mesh_ptr, uv_layer.name, __get_revision(uvs, verts, sizes))
+    island_set = island_cache.get(key)
+    if island_set is None:
+        face_island, loop_uv_vert = __get_island(uvs, verts, sizes)
+        island_set = IslandSet(uvs, sizes, face_island, loop_uv_vert)
+        island_cache.put(key, island_set, island_set.nbytes)
+    else:
+        debug_print("Island cache hit")
+
+    return island_set.bind(faces)
+
+
+class UVClipboard:
+    """
+    Copied UVs stored as flat arrays
+     - uvs: UV of each loop (float32)
+     - pins: pin_uv of each loop packed into bits
+     - seams: seam of the edge of each loop packed into bits
+     - face_offsets: offset of the first loop of each face, and the number
+                     of loops at the end
+     - loop_mates: loop of the other face sharing the edge of each loop
+                   (see get_loop_mates), None if topology is not copied
+     - loop_positions: position of the vertex of each loop (float32) to
+                       tell apart faces symmetric in topology, None if
+                       topology is not copied
+     - copied_time: time when UVs are copied, to find the clipboard copied
+                    last among Blender sessions
+    """
+
+    def __init__(self, uvs, pins, seams, face_offsets, loop_mates=None,
+                 loop_positions=None, copied_time=None):
+        self.uvs = uvs
+        self.pins = pins
+        self.seams = seams
+        self.face_offsets = face_offsets
+        self.loop_mates = loop_mates
+        self.loop_positions = loop_positions
+        if copied_time is None:
+            copied_time = time.time()
+        self.copied_time = copied_time
+        self.__topology_order = None
+
+    @classmethod
+    def from_faces(cls, faces, uv_layer, topology=False):
+        uvs = []
+        pins = []
+        seams = []
+        sizes = [0]
+        for f in faces:
+            sizes.append(len(f.loops))
+            for l in f.loops:
+                luv = l[uv_layer]
+                uvs.extend(luv.uv)
+                pins.append(luv.pin_uv)
+                seams.append(l.edge.seam)
+
+        return cls(np.array(uvs, dtype=np.float32).reshape(-1, 2),
+                   np.packbits(np.array(pins, dtype=bool)),
+                   np.packbits(np.array(seams, dtype=bool)),
+                   np.cumsum(sizes, dtype=np.int64),
+                   get_face_loop_mates(faces) if topology else None,
+                   get_face_loop_positions(faces) if topology else None)
+
+    def __len__(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def num_loops(self):
+        return int(self.face_offsets[-1])
+
+    @property
+    def face_sizes(self):
+        return np.diff(self.face_offsets)
+
+    @property
+    def nbytes(self):
+        nbytes = (self.uvs.nbytes + self.pins.nbytes + self.seams.nbytes +
+                  self.face_offsets.nbytes)
+        if self.loop_mates is not None:
+            nbytes += self.loop_mates.nbytes
+        if self.loop_positions is not None:
+            nbytes += self.loop_positions.nbytes
+        return nbytes
+
+    def unpack_pins(self):
+        return np.unpackbits(self.pins)[:self.num_loops].astype(bool)
+
+    def unpack_seams(self):
+        return np.unpackbits(self.seams)[:self.num_loops].astype(bool)
+
+    def get_face_lists(self):
+        """
+        Get lists of UVs, pin_uvs and seams per face
+        """
+
+        offsets = self.face_offsets.tolist()
+        uvs = self.uvs.tolist()
+        pins = self.unpack_pins().tolist()
+        seams = self.unpack_seams().tolist()
+
+        return ([uvs[s:e] for s, e in zip(offsets[:-1], offsets[1:])],
+                [pins[s:e] for s, e in zip(offsets[:-1], offsets[1:])],
+                [seams[s:e] for s, e in zip(offsets[:-1], offsets[1:])])
+
+    def match_faces(self, face_sizes, loop_mates, loop_positions=None):
+        """
+        Match faces to the copied faces by topology
+        Faces symmetric in topology are matched by loop_positions (see
+        get_topology_order)
+        Returns indices of the copied faces pasted to each face and shifts
+        of their loops, or None if topology differs from copied faces or
+        faces can not be matched uniquely
+        """
+
+        if self.loop_mates is None:
+            return None
+        if len(face_sizes) != len(self):
+            return None
+        face_offsets = np.zeros(len(face_sizes) + 1, dtype=np.int64)
+        np.cumsum(face_sizes, out=face_offsets[1:])
+        if face_offsets[-1] != self.num_loops:
+            return None
+
+        # faces are in the same order as copied
+        if (np.array_equal(face_offsets, self.face_offsets) and
+                np.array_equal(loop_mates, self.loop_mates)):
+            return np.arange(len(self)), np.zeros(len(self), dtype=np.int64)
+
+        if self.__topology_order is None:
+            self.__topology_order = get_topology_order(
+                self.face_offsets, self.loop_mates, self.loop_positions)
+            if self.__topology_order is None:
+                self.__topology_order = False
+        if self.__topology_order is False:
+            return None
+        topology_order = get_topology_order(face_offsets, loop_mates,
+                                            loop_positions)
+        if topology_order is None:
+            return None
+        src_order, src_starts, src_code = self.__topology_order
+        order, starts, code = topology_order
+        if src_code != code:
+            return None
+        face_indices = np.empty(len(self), dtype=np.int64)
+        face_indices[order] = src_order
+
+        return face_indices, src_starts[face_indices] - starts
+
+    def get_loop_indices(self, face_indices, face_sizes, flip=False,
+                         rotate=0, shifts=None):
+        """
+        Get indices of the copied loops pasted to the loops of faces
+        face_indices are indices of the copied faces pasted to each face,
+        and face_sizes are the number of loops of each face
+        shifts are the offsets of the copied loops of each face to align
+        loops before flip and rotation (see match_faces)
+        None is returned if the size of any face differs from copied face
+        """
+
+        face_indices = np.asarray(face_indices, dtype=np.int64)
+        face_sizes = np.asarray(face_sizes, dtype=np.int64)
+        if np.any(self.face_sizes[face_indices] != face_sizes):
+            return None
 
+        # position of each loop in its face
+        starts = np.cumsum(face_sizes) - face_sizes
+        sizes = np.repeat(face_sizes, face_sizes)
+        pos = np.arange(len(sizes), dtype=np.int64) - \
+            np.repeat(starts, face_sizes)
+        if shifts is not None:
+            pos = (pos + np.repeat(shifts, face_sizes)) % sizes
+        pos = (pos - rotate) % sizes
+        if flip:
+            pos = sizes - 1 - pos
+
+        return np.repeat(self.face_offsets[face_indices], face_sizes) + pos
+
+    def paste(self, loops, uv_layer, loop_indices, copy_seams=True):
+        """
+        Paste the copied loops to loops
+        loop_indices are the indices of the copied loop pasted to each loop
+        """
+
+        uvs = self.uvs[loop_indices].tolist()
+        pins = self.unpack_pins()[loop_indices].tolist()
+        for l, uv, pin in zip(loops, uvs, pins):
+            luv = l[uv_layer]
+            luv.uv = uv
+            luv.pin_uv = pin
+        if copy_seams:
+            seams = self.unpack_seams()[loop_indices].tolist()
+            for l, seam in zip(loops, seams):
+                l.edge.seam = seam
+
+    def paste_to_mesh(self, mesh, uv_layer, loop_indices, copy_seams=True):
+        """
+        Paste the copied loops to all faces of the mesh through mesh data
+        arrays, so that the mesh must not be in edit mode
+        loop_indices are the indices of the copied loop pasted to each loop
+        of faces in order
+        """
+
+        _, dest = get_mesh_face_loops(mesh)
+
+        # all loops are pasted, so current UVs need not be read
+        num_loops = len(mesh.loops)
+        uvs = np.empty((num_loops, 2), dtype=np.float32)
+        pins = np.empty(num_loops, dtype=bool)
+        uvs[dest] = self.uvs[loop_indices]
+        pins[dest] = self.unpack_pins()[loop_indices]
+        uv_layer.data.foreach_set("uv", uvs.ravel())
+        uv_layer.data.foreach_set("pin_uv", pins)
+
+        if copy_seams:
+            edge_indices = np.empty(num_loops, dtype=np.int32)
+            seams = np.empty(len(mesh.edges), dtype=bool)
+            mesh.loops.foreach_get("edge_index", edge_indices)
+            mesh.edges.foreach_get("use_seam", seams)
+            # later loop wins on the edge shared by faces, as paste()
+            edges, last = np.unique(edge_indices[dest][::-1],
+                                    return_index=True)
+            seams[edges] = self.unpack_seams()[loop_indices][::-1][last]
+            mesh.edges.foreach_set("use_seam", seams)
+
+        mesh.update()
+
+    def save(self, filepath):
+        """
+        Write clipboard to the file
+         - header (UV_CLIPBOARD_HEADER)
+         - face_offsets (int64), uvs (float32), loop_mates (int32) and
+           loop_positions (float32, only if UV_CLIPBOARD_HAS_TOPOLOGY is
+           set), pins, seams
+        File is replaced at once, so other sessions never read the
+        half-written clipboard
+        """
+
+        flags = 0
+        if self.loop_mates is not None:
+            flags |= UV_CLIPBOARD_HAS_TOPOLOGY
+        header = UV_CLIPBOARD_HEADER.pack(
+            UV_CLIPBOARD_MAGIC, UV_CLIPBOARD_VERSION, flags, len(self),
+            self.num_loops, self.copied_time)
+        tmp_filepath = "%s.%d.tmp" % (filepath, os.getpid())
+        try:
+            with open(tmp_filepath, "wb") as f:
+                f.write(header)
+                f.write(self.face_offsets.astype("<i8").tobytes())
+                f.write(self.uvs.astype("<f4").tobytes())
+                if self.loop_mates is not None:
+                    f.write(self.loop_mates.astype("<i4").tobytes())
+                    f.write(self.loop_positions.astype("<f4").tobytes())
+                f.write(self.pins.tobytes())
+                f.write(self.seams.tobytes())
+            os.replace(tmp_filepath, filepath)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+
+    @classmethod
+    def load(cls, filepath, newer_than=None):
+        """
+        Read the clipboard file
+        Header is checked first, and None is returned without reading the
+        UVs if the clipboard is not copied after newer_than.
+        Arrays are read into memory rather than mapped, because the mapped
+        file can not be replaced by the next save on Windows
+        """
+
+        with open(filepath, "rb") as f:
+            header = f.read(UV_CLIPBOARD_HEADER.size)
+            if len(header) < UV_CLIPBOARD_HEADER.size:
+                raise ValueError("Broken UV clipboard file")
+            magic, version, flags, num_faces, num_loops, copied_time = \
+                UV_CLIPBOARD_HEADER.unpack(header)
+            if (magic != UV_CLIPBOARD_MAGIC or
+                    version != UV_CLIPBOARD_VERSION):
+                raise ValueError("Unsupported UV clipboard file")
+            if newer_than is not None and copied_time <= newer_than:
+                return None
+            has_topology = bool(flags & UV_CLIPBOARD_HAS_TOPOLOGY)
+            num_bytes = (num_loops + 7) // 8
+            size = (UV_CLIPBOARD_HEADER.size + (num_faces + 1) * 8 +
+                    num_loops * 8 + num_bytes * 2)
+            if has_topology:
+                size += num_loops * (4 + 12)
+            if os.fstat(f.fileno()).st_size != size:
+                raise ValueError("Broken UV clipboard file")
+
+            def read(dtype, count):
+                a = np.fromfile(f, dtype=dtype, count=count)
+                if len(a) != count:
+                    raise ValueError("Broken UV clipboard file")
+                return a
+
+            face_offsets = read("<i8", num_faces + 1)
+            uvs = read("<f4", num_loops * 2).reshape(-1, 2)
+            loop_mates = None
+            loop_positions = None
+            if has_topology:
+                loop_mates = read("<i4", num_loops)
+                loop_positions = read("<f4", num_loops * 3).reshape(-1, 3)
+            pins = read(np.uint8, num_bytes)
+            seams = read(np.uint8, num_bytes)
+
+        return cls(uvs, pins, seams, face_offsets, loop_mates,
+                   loop_positions, copied_time)
+
+
+def get_loop_mates(loop_edges):
+    """
+    Get the loop of the other face sharing the edge of each loop
+    loop_edges are the edge index of each loop, and -1 is set to the loop
+    whose edge is not shared by just two faces
+    """
 
-def get_island_info_from_faces(bm, faces, uv_layer):
-    ftv, vtf = __create_vert_face_db(faces, uv_layer)
+    loop_edges = np.asarray(loop_edges)
+    mates = np.full(len(loop_edges), -1, dtype=np.int32)
+    order = np.argsort(loop_edges, kind='mergesort')
+    _, first, counts = np.unique(loop_edges[order], return_index=True,
+                                 return_counts=True)
+    first = first[counts == 2]
+    mates[order[first]] = order[first + 1]
+    mates[order[first + 1]] = order[first]
 
-    # Get island information
-    uv_island_lists = __get_island(bm, ftv, vtf)
-    island_info = __get_island_info(uv_layer, uv_island_lists)
+    return mates
 
-    return island_info
+
+def get_mesh_face_loops(mesh):
+    """
+    Get the number of loops of each face and the loop indices of faces in
+    order from mesh data arrays
+    """
+
+    num_faces = len(mesh.polygons)
+    loop_start = np.empty(num_faces, dtype=np.int32)
+    loop_total = np.empty(num_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    starts = np.cumsum(loop_total) - loop_total
+    loops = np.repeat(loop_start, loop_total) + \
+        np.arange(int(loop_total.sum())) - np.repeat(starts, loop_total)
+
+    return loop_total, loops
+
+
+def get_mesh_loop_mates(mesh):
+    """
+    Get the loop mates of the loops of faces in order from mesh data arrays
+    """
+
+    _, loops = get_mesh_face_loops(mesh)
+    edge_indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", edge_indices)
+
+    return get_loop_mates(edge_indices[loops])
+
+
+def get_face_loop_mates(faces):
+    """
+    Get the loop mates of the loops of faces in order
+    """
+
+    edge_ids = {}
+    loop_edges = [edge_ids.setdefault(l.edge, len(edge_ids))
+                  for f in faces for l in f.loops]
+
+    return get_loop_mates(np.array(loop_edges, dtype=np.int64))
+
+
+def get_mesh_loop_positions(mesh):
+    """
+    Get the vertex positions of the loops of faces in order from mesh data
+    arrays
+    """
+
+    _, loops = get_mesh_face_loops(mesh)
+    vert_indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", vert_indices)
+    cos = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", cos)
+
+    return cos.reshape(-1, 3)[vert_indices[loops]]
+
+
+def get_face_loop_positions(faces):
+    """
+    Get the vertex positions of the loops of faces in order
+    """
+
+    cos = [c for f in faces for l in f.loops for c in l.vert.co]
+
+    return np.array(cos, dtype=np.float32).reshape(-1, 3)
+
+
+def __refine_face_colors(colors, loop_face, loop_mates, face_offsets):
+    """
+    Refine colors of faces by the colors of neighbors (Weisfeiler-Lehman)
+    New colors are numbered in the sorted order of the refined keys, so
+    that they do not depend on the order of faces
+    """
+
+    nbr_colors = np.where(loop_mates >= 0,
+                          colors[loop_face[loop_mates]], -1).tolist()
+    offsets = face_offsets.tolist()
+    keys = [(c, tuple(sorted(nbr_colors[s:e])))
+            for c, s, e in zip(colors.tolist(), offsets[:-1], offsets[1:])]
+    ids = {k: i for i, k in enumerate(sorted(set(keys)))}
+
+    return np.array([ids[k] for k in keys], dtype=np.int64), len(ids)
+
+
+def __walk_faces(seed, start, offsets, loop_face, mates):
+    """
+    Walk connected faces by breadth first search from the seed face
+    Neighbors are visited in the order of loops from the start loop, and
+    the start loop of the visited face is the loop on the entered edge
+    Returns visited faces, start loops and the code describing topology
+    """
+
+    ranks = {seed: 0}
+    starts = {seed: start}
+    order = [seed]
+    code = []
+    for f in order:
+        s = offsets[f]
+        size = offsets[f + 1] - s
+        code.append(size)
+        for i in range(size):
+            m = mates[s + (starts[f] + i) % size]
+            if m < 0:
+                code.append(-1)
+                code.append(-1)
+                continue
+            g = loop_face[m]
+            if g not in ranks:
+                ranks[g] = len(order)
+                starts[g] = m - offsets[g]
+                order.append(g)
+            code.append(ranks[g])
+            code.append((m - offsets[g] - starts[g]) %
+                        (offsets[g + 1] - offsets[g]))
+
+    return order, [starts[f] for f in order], code
+
+
+def __get_loop_vert_keys(face_offsets, loop_mates):
+    """
+    Get the key of the vertex of each loop decided only by topology
+    Loops around the same vertex are linked through the loop mates, and the
+    key is (number of faces around the vertex) * 2 + (1 if on the boundary)
+    """
+
+    num_loops = len(loop_mates)
+    prev_loop = np.arange(-1, num_loops - 1)
+    prev_loop[face_offsets[:-1]] = face_offsets[1:] - 1
+    # mate of the previous loop starts from the same vertex
+    linked = loop_mates[prev_loop]
+    src = np.nonzero(linked >= 0)[0]
+    dst = linked[src]
+
+    # label loops around the same vertex by the smallest loop index
+    labels = np.arange(num_loops)
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, dst, labels[src])
+        np.minimum.at(new_labels, src, labels[dst])
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    num_faces = np.bincount(labels, minlength=num_loops)
+    boundary = np.zeros(num_loops, dtype=bool)
+    boundary[labels[linked < 0]] = True
+
+    return num_faces[labels] * 2 + boundary[labels]
+
+
+def __get_face_components(num_faces, loop_face, loop_mates):
+    """
+    Get the connected component of each face by union-find
+    """
+
+    parent = list(range(num_faces))
+    for l, m in enumerate(loop_mates):
+        if m < 0:
+            continue
+        f1 = loop_face[l]
+        f2 = loop_face[m]
+        while parent[f1] != f1:
+            parent[f1] = parent[parent[f1]]
+            f1 = parent[f1]
+        while parent[f2] != f2:
+            parent[f2] = parent[parent[f2]]
+            f2 = parent[f2]
+        if f1 < f2:
+            parent[f2] = f1
+        elif f2 < f1:
+            parent[f1] = f2
+    components = {}
+    for f in range(num_faces):
+        root = f
+        while parent[root] != root:
+            root = parent[root]
+        components.setdefault(root, []).append(f)
+
+    return list(components.values())
+
+
+def get_topology_order(face_offsets, loop_mates, loop_positions=None,
+                       max_rounds=8, max_seeds=8):
+    """
+    Get the canonical order of faces decided only by topology
+    Faces are colored by their size and the vertex valences, and the colors
+    are refined by neighbors. Connected faces are walked from the seed
+    faces whose color is the rarest one, and the walk giving the smallest
+    code is chosen. Same topology gives the same code regardless of the
+    order of faces and loops, and faces in the same position of the order
+    match.
+    Seeds which can not be told apart by topology (ex. symmetric mesh) are
+    told apart by loop_positions (position of the vertex of each loop).
+    None is returned if they can not be told apart, or more than max_seeds
+    seeds remain, because faces may be matched to their counterpart.
+    Returns order of faces, start loop of each face, and the code
+    """
+
+    face_offsets = np.asarray(face_offsets, dtype=np.int64)
+    loop_mates = np.asarray(loop_mates, dtype=np.int64)
+    num_faces = len(face_offsets) - 1
+    sizes = np.diff(face_offsets)
+    loop_face = np.repeat(np.arange(num_faces), sizes)
+
+    # colors of faces
+    vert_keys = __get_loop_vert_keys(face_offsets, loop_mates).tolist()
+    offsets = face_offsets.tolist()
+    keys = [(e - s, tuple(sorted(vert_keys[s:e])))
+            for s, e in zip(offsets[:-1], offsets[1:])]
+    ids = {k: i for i, k in enumerate(sorted(set(keys)))}
+    colors = np.array([ids[k] for k in keys], dtype=np.int64)
+    num_colors = len(ids)
+    for _ in range(max_rounds):
+        new_colors, n = __refine_face_colors(colors, loop_face, loop_mates,
+                                             face_offsets)
+        if n == num_colors:
+            break
+        colors, num_colors = new_colors, n
+
+    loop_face = loop_face.tolist()
+    mates = loop_mates.tolist()
+    colors = colors.tolist()
+    nbr_colors = [colors[loop_face[m]] if m >= 0 else -1 for m in mates]
+    pos_keys = None
+    if loop_positions is not None:
+        pos_keys = [tuple(p) for p
+                    in np.round(loop_positions, 4).tolist()]
+
+    def seed_key(seed):
+        # directed edge from the start loop is owned by only one face
+        g, i = seed
+        s, size = offsets[g], offsets[g + 1] - offsets[g]
+        return pos_keys[s + i], pos_keys[s + (i + 1) % size]
+
+    def choose_by_position(seeds):
+        if pos_keys is None:
+            return None
+        keys = sorted((seed_key(seed), seed) for seed in seeds)
+        if len(keys) > 1 and keys[0][0] == keys[1][0]:
+            return None
+        return keys[0][1]
+
+    walks = []
+    for faces in __get_face_components(num_faces, loop_face, mates):
+        # seeds are faces of the rarest color, and the start loops are
+        # the loops giving the smallest colors of neighbors among them
+        count = {}
+        for g in faces:
+            count[colors[g]] = count.get(colors[g], 0) + 1
+        rarest = min(count.items(), key=lambda c: (c[1], c[0]))[0]
+        seeds = []
+        min_rot = None
+        for g in faces:
+            if colors[g] != rarest:
+                continue
+            s, e = offsets[g], offsets[g + 1]
+            for i in range(e - s):
+                rot = nbr_colors[s + i:e] + nbr_colors[s:s + i]
+                if min_rot is None or rot < min_rot:
+                    min_rot = rot
+                    seeds = []
+                if rot == min_rot:
+                    seeds.append((g, i))
+
+        # walk from a few seeds, seeds giving the same code are symmetric
+        if len(seeds) <= max_seeds:
+            seed_walks = [(seed, __walk_faces(seed[0], seed[1], offsets,
+                                              loop_face, mates))
+                          for seed in seeds]
+            min_code = min(w[2] for _, w in seed_walks)
+            seed_walks = [(seed, w) for seed, w in seed_walks
+                          if w[2] == min_code]
+            if len(seed_walks) == 1:
+                seed, best = seed_walks[0]
+            else:
+                seed = choose_by_position([seed for seed, _ in seed_walks])
+                if seed is None:
+                    return None
+                best = dict(seed_walks)[seed]
+        else:
+            seed = choose_by_position(seeds)
+            if seed is None:
+                return None
+            best = __walk_faces(seed[0], seed[1], offsets, loop_face, mates)
+        walks.append((len(best[0]), best[2], seed, best))
+
+    # order connected faces by their codes, same connected faces are
+    # ordered by position
+    walks.sort(key=lambda w: (w[0], w[1]))
+    for w1, w2 in zip(walks[:-1], walks[1:]):
+        if w1[0] == w2[0] and w1[1] == w2[1]:
+            if pos_keys is None:
+                return None
+            walks.sort(key=lambda w: (w[0], w[1], seed_key(w[2])))
+            break
+    for w1, w2 in zip(walks[:-1], walks[1:]):
+        if (w1[0] == w2[0] and w1[1] == w2[1] and
+                seed_key(w1[2]) == seed_key(w2[2])):
+            return None
+
+    order = []
+    starts = np.zeros(num_faces, dtype=np.int64)
+    code = []
+    for _, _, _, (faces, walk_starts, walk_code) in walks:
+        order.extend(faces)
+        starts[faces] = walk_starts
+        code.append(len(faces))
+        code.extend(walk_code)
+
+    return np.array(order, dtype=np.int64), starts, code
+
+
+def get_uv_clipboard_filepath(context, name):
+    prefs = context.user_preferences.addons["uv_magic_uv"].preferences
+    dirpath = bpy.path.abspath(prefs.cpuv_clipboard_dir)
+    if not dirpath:
+        # per user directory, so that other users never read the clipboard
+        dirpath = bpy.utils.user_resource('DATAFILES', path="magic_uv",
+                                          autocreate=True)
+    if not dirpath:
+        raise OSError("No directory to share UV clipboard")
+
+    return os.path.join(dirpath, "muv_%s.uvclip" % (name))
+
+
+def save_uv_clipboard(context, name, clipboard):
+    """
+    Share the clipboard with other Blender sessions
+    """
+
+    clipboard.save(get_uv_clipboard_filepath(context, name))
+
+
+def load_uv_clipboard(context, name, clipboard=None):
+    """
+    Get the clipboard copied last among Blender sessions
+    clipboard is the one copied in this session, and returned if it is newer
+    than the shared clipboard or no clipboard is shared
+    """
+
+    newer_than = clipboard.copied_time if clipboard is not None else None
+    try:
+        shared = UVClipboard.load(get_uv_clipboard_filepath(context, name),
+                                  newer_than)
+    except (OSError, ValueError):
+        return clipboard
+    if shared is None:
+        return clipboard
+
+    return shared
 
 
 def get_uvimg_editor_board_size(area):
@@ -239,6 +1108,25 @@ def calc_polygon_2d_area(points):
     return fabs(0.5 * area)
 
 
+def calc_polygon_2d_signed_areas(points, poly_start, poly_size):
+    """
+    Get signed areas of polygons at once by the shoelace formula
+    Polygons are given as the flat array of 2D points and the start/size of
+    each polygon. Area of counter-clockwise polygon is positive
+    """
+
+    if len(poly_size) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    # measure relative to the first point of each polygon for precision
+    pts = points - np.repeat(points[poly_start], poly_size, axis=0)
+    next_pts = np.arange(1, len(pts) + 1)
+    next_pts[poly_start + poly_size - 1] = poly_start
+    cross = pts[:, 0] * pts[next_pts, 1] - pts[:, 1] * pts[next_pts, 0]
+
+    return 0.5 * np.add.reduceat(cross, poly_start)
+
+
 def calc_polygon_3d_area(points):
     area = 0.0
     for i, p1 in enumerate(points):
@@ -289,13 +1177,13 @@ def measure_uv_area(obj):
     tex_layer = bm.faces.layers.tex.verify()
 
     sel_faces = [f for f in bm.faces if f.select]
+    uvs, _, sizes = __get_uv_snapshot(sel_faces, uv_layer)
+    f_uv_areas = np.fabs(calc_polygon_2d_signed_areas(
+        uvs, np.cumsum(sizes) - sizes, sizes)).tolist()
 
     # measure
     uv_area = 0.0
-    for f in sel_faces:
-        uvs = [l[uv_layer].uv for l in f.loops]
-        f_uv_area = calc_polygon_2d_area(uvs)
-
+    for f, f_uv_area in zip(sel_faces, f_uv_areas):
         if not tex_layer:
             return None
         img = f[tex_layer].image
@@ -316,6 +1204,77 @@ def measure_uv_area(obj):
     return uv_area
 
 
+def get_overlapped_aabb_pairs(box_min, box_max):
+    """
+    Get index pairs (i < j) of the axis-aligned bounding boxes which are
+    overlapped each other, by using sweep and prune algorithm.
+    Touching boxes are treated as overlapped.
+    """
+
+    num = len(box_min)
+    if num < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # sweep along the axis where boxes are spread most widely
+    center = (box_min + box_max) * 0.5
+    axis = int(np.argmax(np.var(center, axis=0)))
+    order = np.argsort(box_min[:, axis], kind='mergesort')
+    sorted_min = box_min[order, axis]
+    sorted_max = box_max[order, axis]
+
+    # boxes whose min is in [min, max] of the box are the candidates
+    start = np.arange(1, num + 1)
+    end = np.searchsorted(sorted_min, sorted_max, side='right')
+    counts = np.maximum(end - start, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(num), counts)
+    second = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = second + np.repeat(start, counts)
+    i = order[first]
+    j = order[second]
+
+    # prune with all axes
+    overlapped = np.all((box_min[i] <= box_max[j]) &
+                        (box_min[j] <= box_max[i]), axis=1)
+    i = i[overlapped]
+    j = j[overlapped]
+
+    return np.stack((np.minimum(i, j), np.maximum(i, j)), axis=1)
+
+
+def get_overlapped_aabb_pairs_of(box_min, box_max, indices):
+    """
+    Get index pairs (i < j) of the axis-aligned bounding boxes which are
+    overlapped each other, where i or j is in given indices.
+    Touching boxes are treated as overlapped.
+    """
+
+    num = len(box_min)
+    indices = np.asarray(indices, dtype=np.int64)
+    if num < 2 or len(indices) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # sweep and prune is faster than testing many boxes against all boxes
+    if len(indices) * num > 4000000:
+        pairs = get_overlapped_aabb_pairs(box_min, box_max)
+        mask = np.zeros(num, dtype=bool)
+        mask[indices] = True
+        return pairs[mask[pairs[:, 0]] | mask[pairs[:, 1]]]
+
+    overlapped = np.all((box_min[indices, np.newaxis] <= box_max) &
+                        (box_min <= box_max[indices, np.newaxis]), axis=2)
+    qi, j = np.nonzero(overlapped)
+    i = indices[qi]
+    i, j = i[i != j], j[i != j]
+    if len(i) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # pair of given indices is found twice
+    pairs = np.stack((np.minimum(i, j), np.maximum(i, j)), axis=1)
+
+    return np.unique(pairs, axis=0)
+
+
 def diff_point_to_segment(a, b, p):
     ab = b - a
     normal_ab = ab.normalized()
@@ -332,45 +1291,54 @@ def diff_point_to_segment(a, b, p):
     return xp, x
 
 
+def __update_loop_index(bm):
+    """
+    Update index of loops in the order of faces
+    """
+
+    i = 0
+    for f in bm.faces:
+        for l in f.loops:
+            l.index = i
+            i = i + 1
+
+
+def __get_linked_loops(l):
+    """
+    Get loops which may be connected to the loop, in the order of
+    (forward, backward) for each loop sharing the vertex
+    """
+
+    for ll in l.vert.link_loops:
+        yield ll, ll.link_loop_next
+        yield ll, ll.link_loop_prev
+
+
 # get selected loop pair whose loops are connected each other
 def __get_loop_pairs(l, uv_layer):
-
-    def __get_loop_pairs_internal(l_, pairs_, uv_layer_, parsed_):
-        parsed_.append(l_)
-        for ll in l_.vert.link_loops:
-            # forward direction
-            lln = ll.link_loop_next
-            # if there is same pair, skip it
-            found = False
-            for p in pairs_:
-                if (ll in p) and (lln in p):
-                    found = True
-                    break
+    pairs = []
+    found = set()
+    parsed = {l}
+
+    # traverse the connected loops with an explicit stack to handle the
+    # selection larger than the recursion limit
+    stack = [__get_linked_loops(l)]
+    while stack:
+        for ll, lo in stack[-1]:
             # two loops must be selected
-            if ll[uv_layer_].select and lln[uv_layer_].select:
-                if not found:
-                    pairs_.append([ll, lln])
-                if lln not in parsed_:
-                    __get_loop_pairs_internal(lln, pairs_, uv_layer_, parsed_)
-
-            # backward direction
-            llp = ll.link_loop_prev
+            if not (ll[uv_layer].select and lo[uv_layer].select):
+                continue
             # if there is same pair, skip it
-            found = False
-            for p in pairs_:
-                if (ll in p) and (llp in p):
-                    found = True
-                    break
-            # two loops must be selected
-            if ll[uv_layer_].select and llp[uv_layer_].select:
-                if not found:
-                    pairs_.append([ll, llp])
-                if llp not in parsed_:
-                    __get_loop_pairs_internal(llp, pairs_, uv_layer_, parsed_)
-
-    pairs = []
-    parsed = []
-    __get_loop_pairs_internal(l, pairs, uv_layer, parsed)
+            key = frozenset((ll, lo))
+            if key not in found:
+                found.add(key)
+                pairs.append([ll, lo])
+            if lo not in parsed:
+                parsed.add(lo)
+                stack.append(__get_linked_loops(lo))
+                break
+        else:
+            stack.pop()
 
     return pairs
 
@@ -378,39 +1346,56 @@ def __get_loop_pairs(l, uv_layer):
 # sort pair by vertex
 # (v0, v1) - (v1, v2) - (v2, v3) ....
 def __sort_loop_pairs(uv_layer, pairs, closed):
-    rest = pairs
-    sorted_pairs = [rest[0]]
-    rest.remove(rest[0])
+    if not pairs:
+        return None, "Can not find the selected loop pair"
+
+    # pairs which share the vertex, in the order of the original list
+    vert_to_pairs = {}
+    for i, p in enumerate(pairs):
+        for v in {p[0].vert, p[1].vert}:
+            vert_to_pairs.setdefault(v, []).append(i)
+    heads = dict.fromkeys(vert_to_pairs, 0)
+    used = [False] * len(pairs)
+
+    def __pop_pair(v):
+        # first unused pair which shares the vertex
+        idxs = vert_to_pairs.get(v)
+        if idxs is None:
+            return None
+        h = heads[v]
+        while h < len(idxs) and used[idxs[h]]:
+            h = h + 1
+        heads[v] = h
+        if h == len(idxs):
+            return None
+        used[idxs[h]] = True
+        return pairs[idxs[h]]
+
+    used[0] = True
+    sorted_pairs = deque([pairs[0]])
 
     # prepend
     while True:
         p1 = sorted_pairs[0]
-        for p2 in rest:
-            if p1[0].vert == p2[0].vert:
-                sorted_pairs.insert(0, [p2[1], p2[0]])
-                rest.remove(p2)
-                break
-            elif p1[0].vert == p2[1].vert:
-                sorted_pairs.insert(0, [p2[0], p2[1]])
-                rest.remove(p2)
-                break
-        else:
+        p2 = __pop_pair(p1[0].vert)
+        if p2 is None:
             break
+        if p1[0].vert == p2[0].vert:
+            sorted_pairs.appendleft([p2[1], p2[0]])
+        else:
+            sorted_pairs.appendleft([p2[0], p2[1]])
 
     # append
     while True:
         p1 = sorted_pairs[-1]
-        for p2 in rest:
-            if p1[1].vert == p2[0].vert:
-                sorted_pairs.append([p2[0], p2[1]])
-                rest.remove(p2)
-                break
-            elif p1[1].vert == p2[1].vert:
-                sorted_pairs.append([p2[1], p2[0]])
-                rest.remove(p2)
-                break
-        else:
+        p2 = __pop_pair(p1[1].vert)
+        if p2 is None:
             break
+        if p1[1].vert == p2[0].vert:
+            sorted_pairs.append([p2[0], p2[1]])
+        else:
+            sorted_pairs.append([p2[1], p2[0]])
+    sorted_pairs = list(sorted_pairs)
 
     begin_vert = sorted_pairs[0][0].vert
     end_vert = sorted_pairs[-1][-1].vert
@@ -441,28 +1426,13 @@ def __sort_loop_pairs(uv_layer, pairs, closed):
     return sorted_pairs, ""
 
 
-# get index of the island group which includes loop
-def __get_island_group_include_loop(loop, island_info):
-    for i, isl in enumerate(island_info):
-        for f in isl['faces']:
-            for l in f['face'].loops:
-                if l == loop:
-                    return i    # found
-
-    return -1   # not found
-
-
 # get index of the island group which includes pair.
 # if island group is not same between loops, it will be invalid
-def __get_island_group_include_pair(pair, island_info):
-    l1_grp = __get_island_group_include_loop(pair[0], island_info)
-    if l1_grp == -1:
-        return -1   # not found
-
+def __get_island_group_include_pair(pair, loop_island):
+    l1_grp = loop_island[pair[0].index]
     for p in pair[1:]:
-        l2_grp = __get_island_group_include_loop(p, island_info)
-        if (l2_grp == -1) or (l1_grp != l2_grp):
-            return -1   # not found or invalid
+        if loop_island[p.index] != l1_grp:
+            return -1   # invalid
 
     return l1_grp
 
@@ -517,12 +1487,13 @@ def __get_next_poly_loop_pair(pair):
 
 
 # get loop sequence in the same island
-def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
+def __get_loop_sequence_internal(uv_layer, pairs, loop_island, closed):
     loop_sequences = []
     for pair in pairs:
         seqs = [pair]
+        parsed = {frozenset(pair)}
         p = pair
-        isl_grp = __get_island_group_include_pair(pair, island_info)
+        isl_grp = __get_island_group_include_pair(pair, loop_island)
         if isl_grp == -1:
             return None, "Can not find the island or invalid island"
 
@@ -530,7 +1501,7 @@ def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
             nlp = __get_next_loop_pair(p)
             if not nlp:
                 break       # no more loop pair
-            nlp_isl_grp = __get_island_group_include_pair(nlp, island_info)
+            nlp_isl_grp = __get_island_group_include_pair(nlp, loop_island)
             if nlp_isl_grp != isl_grp:
                 break       # another island
             for nlpl in nlp:
@@ -539,6 +1510,7 @@ def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
                                  "the end edge"
 
             seqs.append(nlp)
+            parsed.add(frozenset(nlp))
 
             # when face is triangle, it indicates CLOSED
             if (len(nlp) == 1) and closed:
@@ -547,20 +1519,14 @@ def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
             nplp = __get_next_poly_loop_pair(nlp)
             if not nplp:
                 break       # no more loop pair
-            nplp_isl_grp = __get_island_group_include_pair(nplp, island_info)
+            nplp_isl_grp = __get_island_group_include_pair(nplp, loop_island)
             if nplp_isl_grp != isl_grp:
                 break       # another island
 
             # check if the UVs are already parsed.
             # this check is needed for the mesh which has the circular
             # sequence of the verticies
-            matched = False
-            for p1 in seqs:
-                p2 = nplp
-                if ((p1[0] == p2[0]) and (p1[1] == p2[1])) or \
-                   ((p1[0] == p2[1]) and (p1[1] == p2[0])):
-                    matched = True
-            if matched:
+            if frozenset(nplp) in parsed:
                 debug_print("This is a circular sequence")
                 break
 
@@ -570,6 +1536,7 @@ def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
                                  "the end edge"
 
             seqs.append(nplp)
+            parsed.add(frozenset(nplp))
 
             p = nplp
 
@@ -577,7 +1544,7 @@ def __get_loop_sequence_internal(uv_layer, pairs, island_info, closed):
     return loop_sequences, ""
 
 
-def get_loop_sequences(bm, uv_layer, closed=False):
+def __get_candidate_loops(bm, uv_layer):
     sel_faces = [f for f in bm.faces if f.select]
 
     # get candidate loops
@@ -587,18 +1554,87 @@ def get_loop_sequences(bm, uv_layer, closed=False):
             if l[uv_layer].select:
                 cand_loops.append(l)
 
-    if len(cand_loops) < 2:
-        return None, "More than 2 UVs must be selected"
+    return cand_loops
 
-    first_loop = cand_loops[0]
-    isl_info = get_island_info_from_bmesh(bm, False)
-    loop_pairs = __get_loop_pairs(first_loop, uv_layer)
+
+def __get_loop_sequences_from_pairs(uv_layer, loop_pairs, loop_island,
+                                    closed):
     loop_pairs, err = __sort_loop_pairs(uv_layer, loop_pairs, closed)
     if not loop_pairs:
         return None, err
     loop_seqs, err = __get_loop_sequence_internal(uv_layer, loop_pairs,
-                                                  isl_info, closed)
+                                                  loop_island, closed)
     if not loop_seqs:
         return None, err
 
     return loop_seqs, ""
+
+
+def get_loop_sequences(bm, uv_layer, closed=False, mesh=None):
+    cand_loops = __get_candidate_loops(bm, uv_layer)
+    if len(cand_loops) < 2:
+        return None, "More than 2 UVs must be selected"
+
+    first_loop = cand_loops[0]
+    __update_loop_index(bm)
+    loop_island = get_island_info_from_bmesh(bm, False,
+                                             mesh).loop_island.tolist()
+    loop_pairs = __get_loop_pairs(first_loop, uv_layer)
+
+    return __get_loop_sequences_from_pairs(uv_layer, loop_pairs, loop_island,
+                                           closed)
+
+
+def get_all_loop_sequences(bm, uv_layer, closed=False, mesh=None):
+    """
+    Get loop sequences of all selected UV loops which are not connected
+    each other
+    """
+
+    cand_loops = __get_candidate_loops(bm, uv_layer)
+    if len(cand_loops) < 2:
+        return None, "More than 2 UVs must be selected"
+
+    __update_loop_index(bm)
+    loop_island = get_island_info_from_bmesh(bm, False,
+                                             mesh).loop_island.tolist()
+
+    all_loop_seqs = []
+    parsed = set()      # vertices which are already parsed
+    for l in cand_loops:
+        if l.vert in parsed:
+            continue
+        parsed.add(l.vert)
+        loop_pairs = __get_loop_pairs(l, uv_layer)
+        if not loop_pairs:
+            continue    # isolated UV
+        for p in loop_pairs:
+            parsed.update([p[0].vert, p[1].vert])
+        loop_seqs, err = __get_loop_sequences_from_pairs(
+            uv_layer, loop_pairs, loop_island, closed)
+        if not loop_seqs:
+            return None, err
+        all_loop_seqs.append(loop_seqs)
+
+    if not all_loop_seqs:
+        return None, "Can not find the selected loop pair"
+
+    return all_loop_seqs, ""
+
+
+def get_loop_sequences_list(bm, uv_layer, multiple, closed=False,
+                            mesh=None):
+    """
+    Get the list of loop sequences.
+    If multiple is False, only the loop sequence which includes the first
+    selected UV is returned
+    """
+
+    if multiple:
+        return get_all_loop_sequences(bm, uv_layer, closed, mesh)
+
+    loop_seqs, err = get_loop_sequences(bm, uv_layer, closed, mesh)
+    if not loop_seqs:
+        return None, err
+
+    return [loop_seqs], ""
@@ -30,20 +30,11 @@ import bpy
 import bmesh
 from mathutils import Vector
 from bpy.props import EnumProperty, BoolProperty
+import numpy as np
 
 from .. import common
 
 
-# get sum vertex length of loop sequences
-def get_loop_vert_len(loops):
-    length = 0
-    for l1, l2 in zip(loops[:-1], loops[1:]):
-        diff = l2.vert.co - l1.vert.co
-        length = length + abs(diff.length)
-
-    return length
-
-
 # get sum uv length of loop sequences
 def get_loop_uv_len(loops, uv_layer):
     length = 0
@@ -103,39 +94,33 @@ class MUV_AUVCircle(bpy.types.Operator):
         description="Select UVs which are aligned",
         default=False
     )
+    multiple = BoolProperty(
+        name="Multiple",
+        description="Align all selected UV loop sequences",
+        default=False
+    )
 
     @classmethod
     def poll(cls, context):
         return context.mode == 'EDIT_MESH'
 
-    def execute(self, context):
-        obj = context.active_object
-        bm = bmesh.from_edit_mesh(obj.data)
-        if common.check_version(2, 73, 0) >= 0:
-            bm.faces.ensure_lookup_table()
-        uv_layer = bm.loops.layers.uv.verify()
+    # check if the loop sequence can be aligned to circle
+    def __check(self, loop_seqs):
+        center = loop_seqs[0][-1][0].vert
+        for hseq in loop_seqs[1:]:
+            if len(hseq[-1]) != 1:
+                return "Last face must be triangle"
+            if hseq[-1][0].vert != center:
+                return "Center must be identical"
 
-        # loop_seqs[horizontal][vertical][loop]
-        loop_seqs, error = common.get_loop_sequences(bm, uv_layer, True)
-        if not loop_seqs:
-            self.report({'WARNING'}, error)
-            return {'CANCELLED'}
+        return ""
 
+    def __align(self, loop_seqs, uv_layer):
         # get circle and new UVs
         uvs = [hseq[0][0][uv_layer].uv.copy() for hseq in loop_seqs]
         c, r = get_circle(uvs[0:3])
         new_uvs = calc_v_on_circle(uvs, c, r)
 
-        # check center UV of circle
-        center = loop_seqs[0][-1][0].vert
-        for hseq in loop_seqs[1:]:
-            if len(hseq[-1]) != 1:
-                self.report({'WARNING'}, "Last face must be triangle")
-                return {'CANCELLED'}
-            if hseq[-1][0].vert != center:
-                self.report({'WARNING'}, "Center must be identical")
-                return {'CANCELLED'}
-
         # align to circle
         if self.transmission:
             for hidx, hseq in enumerate(loop_seqs):
@@ -162,71 +147,94 @@ class MUV_AUVCircle(bpy.types.Operator):
                     pair[0][uv_layer].select = True
                     pair[1][uv_layer].select = True
 
+    def execute(self, context):
+        obj = context.active_object
+        bm = bmesh.from_edit_mesh(obj.data)
+        if common.check_version(2, 73, 0) >= 0:
+            bm.faces.ensure_lookup_table()
+        uv_layer = bm.loops.layers.uv.verify()
+
+        # all_loop_seqs[sequence][horizontal][vertical][loop]
+        all_loop_seqs, error = common.get_loop_sequences_list(
+            bm, uv_layer, self.multiple, True, obj.data)
+        if not all_loop_seqs:
+            self.report({'WARNING'}, error)
+            return {'CANCELLED'}
+
+        # check center UV of circle
+        for loop_seqs in all_loop_seqs:
+            error = self.__check(loop_seqs)
+            if error:
+                self.report({'WARNING'}, error)
+                return {'CANCELLED'}
+
+        for loop_seqs in all_loop_seqs:
+            self.__align(loop_seqs, uv_layer)
+
         bmesh.update_edit_mesh(obj.data)
 
         return {'FINISHED'}
 
 
+# get accumulated vertex length of loop sequences
+def get_loop_vert_accm_len(loops):
+    accm_len = [0.0]
+    length = 0
+    for l1, l2 in zip(loops[:-1], loops[1:]):
+        diff = l2.vert.co - l1.vert.co
+        length = length + abs(diff.length)
+        accm_len.append(length)
+
+    return accm_len
+
+
+# get table to calculate horizontal differential of UV influenced by mesh
+# vertex
+# table[vidx] = (total UV differential, accumulated vertex length)
+def get_hdiff_uv_vinfl_table(uv_layer, loop_seqs):
+    table = []
+    for vidx in range(len(loop_seqs[0])):
+        hloops = []
+        for s in loop_seqs:
+            hloops.extend([s[vidx][0], s[vidx][1]])
+        uv_total_hlen = loop_seqs[-1][vidx][-1][uv_layer].uv - \
+            loop_seqs[0][vidx][0][uv_layer].uv
+        table.append((uv_total_hlen, get_loop_vert_accm_len(hloops)))
+
+    return table
+
+
+# get table to calculate vertical differential of UV influenced by mesh
+# vertex
+# table[hidx][pair_idx] = (total UV differential, accumulated vertex length)
+def get_vdiff_uv_vinfl_table(uv_layer, loop_seqs):
+    table = []
+    for hseq in loop_seqs:
+        pair_table = []
+        for pair_idx in range(2):
+            hloops = [s[pair_idx] for s in hseq]
+            uv_total_hlen = hseq[-1][pair_idx][uv_layer].uv - \
+                hseq[0][pair_idx][uv_layer].uv
+            pair_table.append((uv_total_hlen, get_loop_vert_accm_len(hloops)))
+        table.append(pair_table)
+
+    return table
+
+
 # get horizontal differential of UV influenced by mesh vertex
-def get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, pair_idx):
-    common.debug_print(
-        "vidx={0}, hidx={1}, pair_idx={2}".format(vidx, hidx, pair_idx))
-
-    # get total vertex length
-    hloops = []
-    for s in loop_seqs:
-        hloops.extend([s[vidx][0], s[vidx][1]])
-    vert_total_hlen = get_loop_vert_len(hloops)
-    common.debug_print(vert_total_hlen)
-
-    # target vertex length
-    hloops = []
-    for s in loop_seqs[:hidx]:
-        hloops.extend([s[vidx][0], s[vidx][1]])
-    for pidx, l in enumerate(loop_seqs[hidx][vidx]):
-        if pidx > pair_idx:
-            break
-        hloops.append(l)
-    vert_hlen = get_loop_vert_len(hloops)
-    common.debug_print(vert_hlen)
-
-    # get total UV length
-    # uv_all_hdiff = loop_seqs[-1][0][-1][uv_layer].uv -
-    # loop_seqs[0][0][0][uv_layer].uv
-    uv_total_hlen = loop_seqs[-1][vidx][-1][uv_layer].uv -\
-        loop_seqs[0][vidx][0][uv_layer].uv
-    common.debug_print(uv_total_hlen)
-
-    return uv_total_hlen * vert_hlen / vert_total_hlen
+def get_hdiff_uv_vinfl(table, vidx, hidx, pair_idx):
+    uv_total_hlen, accm_vlen = table[vidx]
+    vert_hlen = accm_vlen[hidx * 2 + pair_idx]
+
+    return uv_total_hlen * vert_hlen / accm_vlen[-1]
 
 
 # get vertical differential of UV influenced by mesh vertex
-def get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, pair_idx):
-    common.debug_print(
-        "vidx={0}, hidx={1}, pair_idx={2}".format(vidx, hidx, pair_idx))
-
-    # get total vertex length
-    hloops = []
-    for s in loop_seqs[hidx]:
-        hloops.append(s[pair_idx])
-    vert_total_hlen = get_loop_vert_len(hloops)
-    common.debug_print(vert_total_hlen)
-
-    # target vertex length
-    hloops = []
-    for s in loop_seqs[hidx][:vidx + 1]:
-        hloops.append(s[pair_idx])
-    vert_hlen = get_loop_vert_len(hloops)
-    common.debug_print(vert_hlen)
-
-    # get total UV length
-    # uv_all_hdiff = loop_seqs[0][-1][pair_idx][uv_layer].uv - \
-    #                loop_seqs[0][0][pair_idx][uv_layer].uv
-    uv_total_hlen = loop_seqs[hidx][-1][pair_idx][uv_layer].uv -\
-        loop_seqs[hidx][0][pair_idx][uv_layer].uv
-    common.debug_print(uv_total_hlen)
-
-    return uv_total_hlen * vert_hlen / vert_total_hlen
+def get_vdiff_uv_vinfl(table, vidx, hidx, pair_idx):
+    uv_total_hlen, accm_vlen = table[hidx][pair_idx]
+    vert_hlen = accm_vlen[vidx]
+
+    return uv_total_hlen * vert_hlen / accm_vlen[-1]
 
 
 # get horizontal differential of UV no influenced
@@ -246,6 +254,84 @@ def get_vdiff_uv(uv_layer, loop_seqs, vidx, hidx):
     return int((vidx + 1) / 2) * v_uv / (len(hseq) / 2)
 
 
+# get UVs and vertex coordinates of loop sequences arranged in grid
+# uvs[horizontal][vertical][loop][uv], cos[horizontal][vertical][loop][co]
+# return None if loop sequences are not arranged in grid
+def get_loop_seqs_grid(uv_layer, loop_seqs):
+    num_v = len(loop_seqs[0])
+    if num_v % 2 != 0:
+        return None
+    for hseq in loop_seqs:
+        if len(hseq) != num_v:
+            return None
+        for pair in hseq:
+            if len(pair) != 2:
+                return None
+
+    loops = [l for hseq in loop_seqs for pair in hseq for l in pair]
+    shape = (len(loop_seqs), num_v, 2)
+    uvs = np.array([l[uv_layer].uv.to_tuple() for l in loops],
+                   dtype=np.float64).reshape(shape + (2,))
+    cos = np.array([l.vert.co.to_tuple() for l in loops],
+                   dtype=np.float64).reshape(shape + (3,))
+
+    return loops, uvs, cos
+
+
+# get accumulated length rate along axis of grid
+def get_grid_accm_len_rate(cos, axis):
+    seg_lens = np.linalg.norm(np.diff(cos, axis=axis), axis=-1)
+    accm_lens = np.cumsum(seg_lens, axis=axis)
+    pad = [(0, 0)] * accm_lens.ndim
+    pad[axis] = (1, 0)
+    accm_lens = np.pad(accm_lens, pad, 'constant')
+
+    return accm_lens / np.take(accm_lens, [-1], axis=axis)
+
+
+# get horizontal differential of UV arranged in grid
+def get_hdiff_uv_grid(uvs, cos, vinfl):
+    num_h, num_v = uvs.shape[:2]
+    if vinfl:
+        # loops along horizontal direction: rows[vertical][loop][co]
+        rows = cos.transpose(1, 0, 2, 3).reshape(num_v, num_h * 2, 3)
+        rate = get_grid_accm_len_rate(rows, 1).reshape(num_v, num_h, 2)
+        uv_total_hlen = uvs[-1, :, -1] - uvs[0, :, 0]
+        return rate.transpose(1, 0, 2)[..., None] * \
+            uv_total_hlen[None, :, None, :]
+
+    h_uv = uvs[-1, 0, 1] - uvs[0, 0, 0]
+    hidx = np.arange(num_h)[:, None] + np.arange(2)[None, :]
+    return np.broadcast_to((hidx / num_h)[:, None, :, None] * h_uv,
+                           uvs.shape)
+
+
+# get vertical differential of UV arranged in grid
+def get_vdiff_uv_grid(uvs, cos, vinfl):
+    num_v = uvs.shape[1]
+    if vinfl:
+        rate = get_grid_accm_len_rate(cos, 1)
+        uv_total_vlen = uvs[:, -1] - uvs[:, 0]
+        return rate[..., None] * uv_total_vlen[:, None]
+
+    v_uv = uvs[0, -1, 0] - uvs[0, 0, 0]
+    vidx = (np.arange(num_v) + 1) // 2
+    return np.broadcast_to((vidx / (num_v / 2))[None, :, None, None] * v_uv,
+                           uvs.shape)
+
+
+# set UVs of loops arranged in grid
+def set_grid_uvs(uv_layer, loops, uvs, select):
+    if not np.all(np.isfinite(uvs)):
+        return False
+    for l, uv in zip(loops, uvs.reshape(-1, 2).tolist()):
+        l[uv_layer].uv = uv
+        if select:
+            l[uv_layer].select = True
+
+    return True
+
+
 class MUV_AUVStraighten(bpy.types.Operator):
 
     bl_idname = "uv.muv_auv_straighten"
@@ -263,6 +349,11 @@ class MUV_AUVStraighten(bpy.types.Operator):
         description="Select UVs which are aligned",
         default=False
     )
+    multiple = BoolProperty(
+        name="Multiple",
+        description="Align all selected UV loop sequences",
+        default=False
+    )
     vertical = BoolProperty(
         name="Vert-Infl (Vertical)",
         description="Align vertical direction influenced "
@@ -284,7 +375,24 @@ class MUV_AUVStraighten(bpy.types.Operator):
     def __align_w_transmission(self, loop_seqs, uv_layer):
         base_uv = loop_seqs[0][0][0][uv_layer].uv.copy()
 
+        # calculate all UVs at once if loop sequences are arranged in grid
+        grid = get_loop_seqs_grid(uv_layer, loop_seqs)
+        if grid:
+            loops, uvs, cos = grid
+            with np.errstate(divide='ignore', invalid='ignore'):
+                hdiff_uvs = get_hdiff_uv_grid(uvs, cos, self.horizontal)
+                vdiff_uvs = get_vdiff_uv_grid(uvs, cos, self.vertical)
+            new_uvs = uvs[0, 0, 0] + hdiff_uvs + vdiff_uvs
+            if set_grid_uvs(uv_layer, loops, new_uvs, self.select):
+                return
+
         # calculate diff UVs
+        hinfl_table = None
+        vinfl_table = None
+        if self.horizontal:
+            hinfl_table = get_hdiff_uv_vinfl_table(uv_layer, loop_seqs)
+        if self.vertical:
+            vinfl_table = get_vdiff_uv_vinfl_table(uv_layer, loop_seqs)
         diff_uvs = []
         # hseq[vertical][loop]
         for hidx, hseq in enumerate(loop_seqs):
@@ -293,12 +401,10 @@ class MUV_AUVStraighten(bpy.types.Operator):
             for vidx in range(0, len(hseq), 2):
                 if self.horizontal:
                     hdiff_uvs = [
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 1),
                     ]
                 else:
                     hdiff_uvs = [
@@ -309,12 +415,10 @@ class MUV_AUVStraighten(bpy.types.Operator):
                     ]
                 if self.vertical:
                     vdiff_uvs = [
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 1),
                     ]
                 else:
                     vdiff_uvs = [
@@ -368,14 +472,16 @@ class MUV_AUVStraighten(bpy.types.Operator):
             bm.faces.ensure_lookup_table()
         uv_layer = bm.loops.layers.uv.verify()
 
-        # loop_seqs[horizontal][vertical][loop]
-        loop_seqs, error = common.get_loop_sequences(bm, uv_layer)
-        if not loop_seqs:
+        # all_loop_seqs[sequence][horizontal][vertical][loop]
+        all_loop_seqs, error = common.get_loop_sequences_list(
+            bm, uv_layer, self.multiple, mesh=obj.data)
+        if not all_loop_seqs:
             self.report({'WARNING'}, error)
             return {'CANCELLED'}
 
         # align
-        self.__align(loop_seqs, uv_layer)
+        for loop_seqs in all_loop_seqs:
+            self.__align(loop_seqs, uv_layer)
 
         bmesh.update_edit_mesh(obj.data)
 
@@ -399,6 +505,11 @@ class MUV_AUVAxis(bpy.types.Operator):
         description="Select UVs which are aligned",
         default=False
     )
+    multiple = BoolProperty(
+        name="Multiple",
+        description="Align all selected UV loop sequences",
+        default=False
+    )
     vertical = BoolProperty(
         name="Vert-Infl (Vertical)",
         description="Align vertical direction influenced "
@@ -570,7 +681,30 @@ class MUV_AUVAxis(bpy.types.Operator):
             offset_uvs.append([luv0.uv + aduv[0] - base_uv,
                                luv1.uv + aduv[1] - base_uv])
 
+        # calculate all UVs at once if loop sequences are arranged in grid
+        grid = get_loop_seqs_grid(uv_layer, loop_seqs)
+        if grid:
+            loops, uvs, cos = grid
+            offsets = np.array([[o.to_tuple() for o in ouv]
+                                for ouv in offset_uvs])[:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if self.horizontal:
+                    hdiff_uvs = get_hdiff_uv_grid(uvs, cos, True)
+                    hdiff_uvs[..., 1] += offsets[..., 1]
+                else:
+                    hdiff_uvs = offsets
+                vdiff_uvs = get_vdiff_uv_grid(uvs, cos, self.vertical)
+            new_uvs = uvs[0, 0, 0] + hdiff_uvs + vdiff_uvs
+            if set_grid_uvs(uv_layer, loops, new_uvs, self.select):
+                return
+
         # get UV differential
+        hinfl_table = None
+        vinfl_table = None
+        if self.horizontal:
+            hinfl_table = get_hdiff_uv_vinfl_table(uv_layer, loop_seqs)
+        if self.vertical:
+            vinfl_table = get_vdiff_uv_vinfl_table(uv_layer, loop_seqs)
         diff_uvs = []
         # hseq[vertical][loop]
         for hidx, hseq in enumerate(loop_seqs):
@@ -579,12 +713,10 @@ class MUV_AUVAxis(bpy.types.Operator):
             for vidx in range(0, len(hseq), 2):
                 if self.horizontal:
                     hdiff_uvs = [
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 1),
                     ]
                     hdiff_uvs[0].y = hdiff_uvs[0].y + offset_uvs[hidx][0].y
                     hdiff_uvs[1].y = hdiff_uvs[1].y + offset_uvs[hidx][1].y
@@ -599,12 +731,10 @@ class MUV_AUVAxis(bpy.types.Operator):
                     ]
                 if self.vertical:
                     vdiff_uvs = [
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 1),
                     ]
                 else:
                     vdiff_uvs = [
@@ -655,7 +785,30 @@ class MUV_AUVAxis(bpy.types.Operator):
             offset_uvs.append([luv0.uv + aduv[0] - base_uv,
                                luv1.uv + aduv[1] - base_uv])
 
+        # calculate all UVs at once if loop sequences are arranged in grid
+        grid = get_loop_seqs_grid(uv_layer, loop_seqs)
+        if grid:
+            loops, uvs, cos = grid
+            offsets = np.array([[o.to_tuple() for o in ouv]
+                                for ouv in offset_uvs])[:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if self.horizontal:
+                    hdiff_uvs = get_hdiff_uv_grid(uvs, cos, True)
+                    hdiff_uvs[..., 0] += offsets[..., 0]
+                else:
+                    hdiff_uvs = offsets
+                vdiff_uvs = get_vdiff_uv_grid(uvs, cos, self.vertical)
+            new_uvs = uvs[0, 0, 0] + hdiff_uvs + vdiff_uvs
+            if set_grid_uvs(uv_layer, loops, new_uvs, self.select):
+                return
+
         # get UV differential
+        hinfl_table = None
+        vinfl_table = None
+        if self.horizontal:
+            hinfl_table = get_hdiff_uv_vinfl_table(uv_layer, loop_seqs)
+        if self.vertical:
+            vinfl_table = get_vdiff_uv_vinfl_table(uv_layer, loop_seqs)
         diff_uvs = []
         # hseq[vertical][loop]
         for hidx, hseq in enumerate(loop_seqs):
@@ -664,12 +817,10 @@ class MUV_AUVAxis(bpy.types.Operator):
             for vidx in range(0, len(hseq), 2):
                 if self.horizontal:
                     hdiff_uvs = [
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_hdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx, hidx, 1),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 0),
+                        get_hdiff_uv_vinfl(hinfl_table, vidx + 1, hidx, 1),
                     ]
                     hdiff_uvs[0].x = hdiff_uvs[0].x + offset_uvs[hidx][0].x
                     hdiff_uvs[1].x = hdiff_uvs[1].x + offset_uvs[hidx][1].x
@@ -684,12 +835,10 @@ class MUV_AUVAxis(bpy.types.Operator):
                     ]
                 if self.vertical:
                     vdiff_uvs = [
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx, hidx, 1),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 0),
-                        get_vdiff_uv_vinfl(uv_layer, loop_seqs, vidx + 1,
-                                           hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx, hidx, 1),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 0),
+                        get_vdiff_uv_vinfl(vinfl_table, vidx + 1, hidx, 1),
                     ]
                 else:
                     vdiff_uvs = [
@@ -739,18 +888,20 @@ class MUV_AUVAxis(bpy.types.Operator):
             bm.faces.ensure_lookup_table()
         uv_layer = bm.loops.layers.uv.verify()
 
-        # loop_seqs[horizontal][vertical][loop]
-        loop_seqs, error = common.get_loop_sequences(bm, uv_layer)
-        if not loop_seqs:
+        # all_loop_seqs[sequence][horizontal][vertical][loop]
+        all_loop_seqs, error = common.get_loop_sequences_list(
+            bm, uv_layer, self.multiple, mesh=obj.data)
+        if not all_loop_seqs:
             self.report({'WARNING'}, error)
             return {'CANCELLED'}
 
-        # get height and width
-        uv_max, uv_min = self.__get_uv_max_min(loop_seqs, uv_layer)
-        width = uv_max.x - uv_min.x
-        height = uv_max.y - uv_min.y
+        for loop_seqs in all_loop_seqs:
+            # get height and width
+            uv_max, uv_min = self.__get_uv_max_min(loop_seqs, uv_layer)
+            width = uv_max.x - uv_min.x
+            height = uv_max.y - uv_min.y
 
-        self.__align(loop_seqs, uv_layer, uv_min, width, height)
+            self.__align(loop_seqs, uv_layer, uv_min, width, height)
 
         bmesh.update_edit_mesh(obj.data)
 
@@ -35,6 +35,7 @@ from bpy.props import (
     EnumProperty,
 )
 from mathutils import Vector
+import numpy as np
 
 from .. import common
 
@@ -74,21 +75,17 @@ class MUV_CPUVCopyUV(bpy.types.Operator):
             uv_layer = bm.loops.layers.uv[self.uv_map]
 
         # get selected face
-        props.src_uvs = []
-        props.src_pin_uvs = []
-        props.src_seams = []
-        for face in bm.faces:
-            if face.select:
-                uvs = [l[uv_layer].uv.copy() for l in face.loops]
-                pin_uvs = [l[uv_layer].pin_uv for l in face.loops]
-                seams = [l.edge.seam for l in face.loops]
-                props.src_uvs.append(uvs)
-                props.src_pin_uvs.append(pin_uvs)
-                props.src_seams.append(seams)
-        if not props.src_uvs or not props.src_pin_uvs:
+        props.clipboard = common.UVClipboard.from_faces(
+            [f for f in bm.faces if f.select], uv_layer, topology=True)
+        if not props.clipboard:
             self.report({'WARNING'}, "No faces are selected")
             return {'CANCELLED'}
-        self.report({'INFO'}, "%d face(s) are selected" % len(props.src_uvs))
+        self.report({'INFO'}, "%d face(s) are selected (%.1f KB)"
+                    % (len(props.clipboard), props.clipboard.nbytes / 1024))
+        try:
+            common.save_uv_clipboard(context, "cpuv", props.clipboard)
+        except OSError as e:
+            self.report({'WARNING'}, "Failed to share copied UV (%s)" % (e))
 
         return {'FINISHED'}
 
@@ -160,7 +157,8 @@ class MUV_CPUVPasteUV(bpy.types.Operator):
 
     def execute(self, context):
         props = context.scene.muv_props.cpuv
-        if not props.src_uvs or not props.src_pin_uvs:
+        clipboard = common.load_uv_clipboard(context, "cpuv", props.clipboard)
+        if not clipboard:
             self.report({'WARNING'}, "Need copy UV at first")
             return {'CANCELLED'}
         if self.uv_map == "":
@@ -184,73 +182,47 @@ class MUV_CPUVPasteUV(bpy.types.Operator):
             uv_layer = bm.loops.layers.uv[self.uv_map]
 
         # get selected face
-        dest_uvs = []
-        dest_pin_uvs = []
-        dest_seams = []
-        dest_face_indices = []
-        for face in bm.faces:
-            if face.select:
-                dest_face_indices.append(face.index)
-                uvs = [l[uv_layer].uv.copy() for l in face.loops]
-                pin_uvs = [l[uv_layer].pin_uv for l in face.loops]
-                seams = [l.edge.seam for l in face.loops]
-                dest_uvs.append(uvs)
-                dest_pin_uvs.append(pin_uvs)
-                dest_seams.append(seams)
-        if not dest_uvs or not dest_pin_uvs:
+        dest_faces = [f for f in bm.faces if f.select]
+        if not dest_faces:
             self.report({'WARNING'}, "No faces are selected")
             return {'CANCELLED'}
-        if self.strategy == 'N_N' and len(props.src_uvs) != len(dest_uvs):
+        if self.strategy == 'N_N' and len(clipboard) != len(dest_faces):
             self.report(
                 {'WARNING'},
                 "Number of selected faces is different from copied" +
                 "(src:%d, dest:%d)" %
-                (len(props.src_uvs), len(dest_uvs)))
+                (len(clipboard), len(dest_faces)))
+            return {'CANCELLED'}
+
+        # get copied loop pasted to each loop
+        face_sizes = [len(f.loops) for f in dest_faces]
+        src_face_indices = np.arange(len(dest_faces)) % len(clipboard)
+        shifts = None
+        matched = True
+        if self.strategy == 'N_N' and clipboard.loop_mates is not None:
+            # match faces by topology if they are in different order
+            match = clipboard.match_faces(
+                face_sizes, common.get_face_loop_mates(dest_faces),
+                common.get_face_loop_positions(dest_faces))
+            if match is not None:
+                src_face_indices, shifts = match
+            else:
+                matched = False
+        loop_indices = clipboard.get_loop_indices(
+            src_face_indices, face_sizes, self.flip_copied_uv,
+            self.rotate_copied_uv, shifts)
+        if loop_indices is None:
+            self.report({'WARNING'}, "Some faces are different size")
             return {'CANCELLED'}
 
         # paste
-        for i, idx in enumerate(dest_face_indices):
-            suv = None
-            spuv = None
-            ss = None
-            duv = None
-            if self.strategy == 'N_N':
-                suv = props.src_uvs[i]
-                spuv = props.src_pin_uvs[i]
-                ss = props.src_seams[i]
-                duv = dest_uvs[i]
-            elif self.strategy == 'N_M':
-                suv = props.src_uvs[i % len(props.src_uvs)]
-                spuv = props.src_pin_uvs[i % len(props.src_pin_uvs)]
-                ss = props.src_seams[i % len(props.src_seams)]
-                duv = dest_uvs[i]
-            if len(suv) != len(duv):
-                self.report({'WARNING'}, "Some faces are different size")
-                return {'CANCELLED'}
-            suvs_fr = [uv for uv in suv]
-            spuvs_fr = [pin_uv for pin_uv in spuv]
-            ss_fr = [s for s in ss]
-            # flip UVs
-            if self.flip_copied_uv is True:
-                suvs_fr.reverse()
-                spuvs_fr.reverse()
-                ss_fr.reverse()
-            # rotate UVs
-            for _ in range(self.rotate_copied_uv):
-                uv = suvs_fr.pop()
-                pin_uv = spuvs_fr.pop()
-                s = ss_fr.pop()
-                suvs_fr.insert(0, uv)
-                spuvs_fr.insert(0, pin_uv)
-                ss_fr.insert(0, s)
-            # paste UVs
-            for l, suv, spuv, ss in zip(bm.faces[idx].loops, suvs_fr,
-                                        spuvs_fr, ss_fr):
-                l[uv_layer].uv = suv
-                l[uv_layer].pin_uv = spuv
-                if self.copy_seams is True:
-                    l.edge.seam = ss
-        self.report({'INFO'}, "%d face(s) are copied" % len(dest_uvs))
+        clipboard.paste([l for f in dest_faces for l in f.loops], uv_layer,
+                        loop_indices, self.copy_seams)
+        self.report({'INFO'}, "%d face(s) are copied" % len(dest_faces))
+        if not matched:
+            self.report({'WARNING'},
+                        "Topology does not match or faces are symmetric; "
+                        "pasted by face order")
 
         bmesh.update_edit_mesh(obj.data)
         if self.copy_seams is True:
@@ -308,17 +280,14 @@ class MUV_CPUVIECopyUV(bpy.types.Operator):
         if common.check_version(2, 73, 0) >= 0:
             bm.faces.ensure_lookup_table()
 
-        for face in bm.faces:
-            if not face.select:
-                continue
-            skip = False
-            for l in face.loops:
-                if not l[uv_layer].select:
-                    skip = True
-                    break
-            if skip:
-                continue
-            props.src_uvs.append([l[uv_layer].uv.copy() for l in face.loops])
+        props.clipboard = common.UVClipboard.from_faces(
+            [f for f in bm.faces
+             if f.select and all(l[uv_layer].select for l in f.loops)],
+            uv_layer)
+        try:
+            common.save_uv_clipboard(context, "cpuv", props.clipboard)
+        except OSError as e:
+            self.report({'WARNING'}, "Failed to share copied UV (%s)" % (e))
 
         return {'FINISHED'}
 
@@ -345,6 +314,12 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
         if common.check_version(2, 73, 0) >= 0:
             bm.faces.ensure_lookup_table()
 
+        clipboard = common.load_uv_clipboard(context, "cpuv", props.clipboard)
+        src_uvs = []
+        if clipboard:
+            src_uvs = [[Vector(uv) for uv in uvs]
+                       for uvs in clipboard.get_face_lists()[0]]
+
         dest_uvs = []
         dest_face_indices = []
         for face in bm.faces:
@@ -361,7 +336,7 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
             uvs = [l[uv_layer].uv.copy() for l in face.loops]
             dest_uvs.append(uvs)
 
-        for suvs, duvs in zip(props.src_uvs, dest_uvs):
+        for suvs, duvs in zip(src_uvs, dest_uvs):
             src_diff = suvs[1] - suvs[0]
             dest_diff = duvs[1] - duvs[0]
 
@@ -380,7 +355,7 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
             ratio = dest_diff.length / src_diff.length
             break
 
-        for suvs, fidx in zip(props.src_uvs, dest_face_indices):
+        for suvs, fidx in zip(src_uvs, dest_face_indices):
             for l, suv in zip(bm.faces[fidx].loops, suvs):
                 base = suv - src_base
                 radian_ref = atan2(base.y, base.x)
@@ -434,21 +409,19 @@ class MUV_CPUVSelSeqCopyUV(bpy.types.Operator):
             uv_layer = bm.loops.layers.uv[self.uv_map]
 
         # get selected face
-        props.src_uvs = []
-        props.src_pin_uvs = []
-        props.src_seams = []
-        for hist in bm.select_history:
-            if isinstance(hist, bmesh.types.BMFace) and hist.select:
-                uvs = [l[uv_layer].uv.copy() for l in hist.loops]
-                pin_uvs = [l[uv_layer].pin_uv for l in hist.loops]
-                seams = [l.edge.seam for l in hist.loops]
-                props.src_uvs.append(uvs)
-                props.src_pin_uvs.append(pin_uvs)
-                props.src_seams.append(seams)
-        if not props.src_uvs or not props.src_pin_uvs:
+        props.clipboard = common.UVClipboard.from_faces(
+            [hist for hist in bm.select_history
+             if isinstance(hist, bmesh.types.BMFace) and hist.select],
+            uv_layer)
+        if not props.clipboard:
             self.report({'WARNING'}, "No faces are selected")
             return {'CANCELLED'}
-        self.report({'INFO'}, "%d face(s) are selected" % len(props.src_uvs))
+        self.report({'INFO'}, "%d face(s) are selected (%.1f KB)"
+                    % (len(props.clipboard), props.clipboard.nbytes / 1024))
+        try:
+            common.save_uv_clipboard(context, "cpuv_selseq", props.clipboard)
+        except OSError as e:
+            self.report({'WARNING'}, "Failed to share copied UV (%s)" % (e))
 
         return {'FINISHED'}
 
@@ -515,7 +488,9 @@ class MUV_CPUVSelSeqPasteUV(bpy.types.Operator):
 
     def execute(self, context):
         props = context.scene.muv_props.cpuv_selseq
-        if not props.src_uvs or not props.src_pin_uvs:
+        clipboard = common.load_uv_clipboard(context, "cpuv_selseq",
+                                             props.clipboard)
+        if not clipboard:
             self.report({'WARNING'}, "Need copy UV at first")
             return {'CANCELLED'}
         if self.uv_map == "":
@@ -542,74 +517,32 @@ class MUV_CPUVSelSeqPasteUV(bpy.types.Operator):
             uv_layer = bm.loops.layers.uv[self.uv_map]
 
         # get selected face
-        dest_uvs = []
-        dest_pin_uvs = []
-        dest_seams = []
-        dest_face_indices = []
-        for hist in bm.select_history:
-            if isinstance(hist, bmesh.types.BMFace) and hist.select:
-                dest_face_indices.append(hist.index)
-                uvs = [l[uv_layer].uv.copy() for l in hist.loops]
-                pin_uvs = [l[uv_layer].pin_uv for l in hist.loops]
-                seams = [l.edge.seam for l in hist.loops]
-                dest_uvs.append(uvs)
-                dest_pin_uvs.append(pin_uvs)
-                dest_seams.append(seams)
-        if not dest_uvs or not dest_pin_uvs:
+        dest_faces = [hist for hist in bm.select_history
+                      if isinstance(hist, bmesh.types.BMFace) and hist.select]
+        if not dest_faces:
             self.report({'WARNING'}, "No faces are selected")
             return {'CANCELLED'}
-        if self.strategy == 'N_N' and len(props.src_uvs) != len(dest_uvs):
+        if self.strategy == 'N_N' and len(clipboard) != len(dest_faces):
             self.report(
                 {'WARNING'},
                 "Number of selected faces is different from copied faces " +
                 "(src:%d, dest:%d)"
-                % (len(props.src_uvs), len(dest_uvs)))
+                % (len(clipboard), len(dest_faces)))
+            return {'CANCELLED'}
+
+        # get copied loop pasted to each loop
+        src_face_indices = np.arange(len(dest_faces)) % len(clipboard)
+        loop_indices = clipboard.get_loop_indices(
+            src_face_indices, [len(f.loops) for f in dest_faces],
+            self.flip_copied_uv, self.rotate_copied_uv)
+        if loop_indices is None:
+            self.report({'WARNING'}, "Some faces are different size")
             return {'CANCELLED'}
 
         # paste
-        for i, idx in enumerate(dest_face_indices):
-            suv = None
-            spuv = None
-            ss = None
-            duv = None
-            if self.strategy == 'N_N':
-                suv = props.src_uvs[i]
-                spuv = props.src_pin_uvs[i]
-                ss = props.src_seams[i]
-                duv = dest_uvs[i]
-            elif self.strategy == 'N_M':
-                suv = props.src_uvs[i % len(props.src_uvs)]
-                spuv = props.src_pin_uvs[i % len(props.src_pin_uvs)]
-                ss = props.src_seams[i % len(props.src_seams)]
-                duv = dest_uvs[i]
-            if len(suv) != len(duv):
-                self.report({'WARNING'}, "Some faces are different size")
-                return {'CANCELLED'}
-            suvs_fr = [uv for uv in suv]
-            spuvs_fr = [pin_uv for pin_uv in spuv]
-            ss_fr = [s for s in ss]
-            # flip UVs
-            if self.flip_copied_uv is True:
-                suvs_fr.reverse()
-                spuvs_fr.reverse()
-                ss_fr.reverse()
-            # rotate UVs
-            for _ in range(self.rotate_copied_uv):
-                uv = suvs_fr.pop()
-                pin_uv = spuvs_fr.pop()
-                s = ss_fr.pop()
-                suvs_fr.insert(0, uv)
-                spuvs_fr.insert(0, pin_uv)
-                ss_fr.insert(0, s)
-            # paste UVs
-            for l, suv, spuv, ss in zip(bm.faces[idx].loops, suvs_fr,
-                                        spuvs_fr, ss_fr):
-                l[uv_layer].uv = suv
-                l[uv_layer].pin_uv = spuv
-                if self.copy_seams is True:
-                    l.edge.seam = ss
-
-        self.report({'INFO'}, "%d face(s) are copied" % len(dest_uvs))
+        clipboard.paste([l for f in dest_faces for l in f.loops], uv_layer,
+                        loop_indices, self.copy_seams)
+        self.report({'INFO'}, "%d face(s) are copied" % len(dest_faces))
 
         bmesh.update_edit_mesh(obj.data)
         if self.copy_seams is True:
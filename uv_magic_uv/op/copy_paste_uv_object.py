@@ -23,12 +23,15 @@ __status__ = "production"
 __version__ = "5.1"
 __date__ = "24 Feb 2018"
 
+from collections import OrderedDict
+
 import bpy
 import bmesh
 from bpy.props import (
     StringProperty,
     BoolProperty,
 )
+import numpy as np
 
 from .. import common
 
@@ -81,18 +84,15 @@ class MUV_CPUVObjCopyUV(bpy.types.Operator):
             uv_layer = bm.loops.layers.uv[self.uv_map]
 
         # get selected face
-        props.src_uvs = []
-        props.src_pin_uvs = []
-        props.src_seams = []
-        for face in bm.faces:
-            uvs = [l[uv_layer].uv.copy() for l in face.loops]
-            pin_uvs = [l[uv_layer].pin_uv for l in face.loops]
-            seams = [l.edge.seam for l in face.loops]
-            props.src_uvs.append(uvs)
-            props.src_pin_uvs.append(pin_uvs)
-            props.src_seams.append(seams)
-
-        self.report({'INFO'}, "%s's UV coordinates are copied" % (obj.name))
+        props.clipboard = common.UVClipboard.from_faces(bm.faces, uv_layer,
+                                                        topology=True)
+
+        self.report({'INFO'}, "%s's UV coordinates are copied (%.1f KB)"
+                    % (obj.name, props.clipboard.nbytes / 1024))
+        try:
+            common.save_uv_clipboard(context, "cpuv_obj", props.clipboard)
+        except OSError as e:
+            self.report({'WARNING'}, "Failed to share copied UV (%s)" % (e))
 
         return {'FINISHED'}
 
@@ -133,94 +133,104 @@ class MUV_CPUVObjPasteUV(bpy.types.Operator):
         default=True
     )
 
-    @memorize_view_3d_mode
     def execute(self, context):
         props = context.scene.muv_props.cpuv_obj
-        if not props.src_uvs or not props.src_pin_uvs:
+        clipboard = common.load_uv_clipboard(context, "cpuv_obj",
+                                             props.clipboard)
+        if not clipboard:
             self.report({'WARNING'}, "Need copy UV at first")
             return {'CANCELLED'}
 
+        # group objects by mesh, so that shared mesh is pasted only once
+        targets = OrderedDict()
         for o in bpy.data.objects:
             if not hasattr(o.data, "uv_textures") or not o.select:
                 continue
-
-            bpy.ops.object.mode_set(mode='OBJECT')
-            bpy.context.scene.objects.active = o
-            bpy.ops.object.mode_set(mode='EDIT')
-
-            obj = context.active_object
-            bm = bmesh.from_edit_mesh(obj.data)
-            if common.check_version(2, 73, 0) >= 0:
-                bm.faces.ensure_lookup_table()
-
-            if (self.uv_map == "" or
-                    self.uv_map not in bm.loops.layers.uv.keys()):
-                self.report({'INFO'}, "Paste UV coordinate per object")
+            targets.setdefault(o.data.as_pointer(), []).append(o)
+
+        # check all meshes before pasting
+        pastes = []
+        for objs in targets.values():
+            mesh = objs[0].data
+            if self.uv_map == "" or self.uv_map not in mesh.uv_layers:
+                uv_layer = mesh.uv_layers.active
             else:
+                uv_layer = mesh.uv_layers[self.uv_map]
+            if uv_layer is None:
                 self.report(
-                    {'INFO'},
-                    "Paste UV coordinate per object (UV map: %s)"
-                    % (self.uv_map))
+                    {'WARNING'}, "Object must have more than one UV map")
+                return {'CANCELLED'}
 
-            # get UV layer
-            if (self.uv_map == "" or
-                    self.uv_map not in bm.loops.layers.uv.keys()):
-                if not bm.loops.layers.uv:
-                    self.report(
-                        {'WARNING'}, "Object must have more than one UV map")
-                    return {'CANCELLED'}
-                uv_layer = bm.loops.layers.uv.verify()
+            # mesh in edit mode is pasted through bmesh
+            if mesh.is_editmode:
+                bm = bmesh.from_edit_mesh(mesh)
+                dest_loops = [l for f in bm.faces for l in f.loops]
+                face_sizes = [len(f.loops) for f in bm.faces]
+                uv_layer = bm.loops.layers.uv[uv_layer.name]
             else:
-                uv_layer = bm.loops.layers.uv[self.uv_map]
-
-            # get selected face
-            dest_uvs = []
-            dest_pin_uvs = []
-            dest_seams = []
-            dest_face_indices = []
-            for face in bm.faces:
-                dest_face_indices.append(face.index)
-                uvs = [l[uv_layer].uv.copy() for l in face.loops]
-                pin_uvs = [l[uv_layer].pin_uv for l in face.loops]
-                seams = [l.edge.seam for l in face.loops]
-                dest_uvs.append(uvs)
-                dest_pin_uvs.append(pin_uvs)
-                dest_seams.append(seams)
-            if len(props.src_uvs) != len(dest_uvs):
+                dest_loops = None
+                face_sizes, _ = common.get_mesh_face_loops(mesh)
+            if len(clipboard) != len(face_sizes):
                 self.report(
                     {'WARNING'},
                     "Number of faces is different from copied " +
                     "(src:%d, dest:%d)"
-                    % (len(props.src_uvs), len(dest_uvs))
+                    % (len(clipboard), len(face_sizes))
                 )
                 return {'CANCELLED'}
 
-            # paste
-            for i, idx in enumerate(dest_face_indices):
-                suv = props.src_uvs[i]
-                spuv = props.src_pin_uvs[i]
-                ss = props.src_seams[i]
-                duv = dest_uvs[i]
-                if len(suv) != len(duv):
-                    self.report({'WARNING'}, "Some faces are different size")
-                    return {'CANCELLED'}
-                suvs_fr = [uv for uv in suv]
-                spuvs_fr = [pin_uv for pin_uv in spuv]
-                ss_fr = [s for s in ss]
-                # paste UVs
-                for l, suv, spuv, ss in zip(
-                        bm.faces[idx].loops, suvs_fr, spuvs_fr, ss_fr):
-                    l[uv_layer].uv = suv
-                    l[uv_layer].pin_uv = spuv
-                    if self.copy_seams is True:
-                        l.edge.seam = ss
-
-            bmesh.update_edit_mesh(obj.data)
+            # match faces by topology if they are in different order
+            match = None
+            if clipboard.loop_mates is not None:
+                if mesh.is_editmode:
+                    loop_mates = common.get_face_loop_mates(bm.faces)
+                    loop_positions = common.get_face_loop_positions(bm.faces)
+                else:
+                    loop_mates = common.get_mesh_loop_mates(mesh)
+                    loop_positions = common.get_mesh_loop_positions(mesh)
+                match = clipboard.match_faces(face_sizes, loop_mates,
+                                              loop_positions)
+            matched = match is not None or clipboard.loop_mates is None
+            if match is None:
+                match = (np.arange(len(clipboard)), None)
+            loop_indices = clipboard.get_loop_indices(
+                match[0], face_sizes, shifts=match[1])
+            if loop_indices is None:
+                self.report({'WARNING'}, "Some faces are different size")
+                return {'CANCELLED'}
+            pastes.append((objs, mesh, uv_layer, dest_loops, loop_indices,
+                           matched))
+
+        # paste
+        for objs, mesh, uv_layer, dest_loops, loop_indices, matched \
+                in pastes:
+            if self.uv_map == "" or self.uv_map != uv_layer.name:
+                self.report({'INFO'}, "Paste UV coordinate per object")
+            else:
+                self.report(
+                    {'INFO'},
+                    "Paste UV coordinate per object (UV map: %s)"
+                    % (self.uv_map))
+
+            if dest_loops is not None:
+                clipboard.paste(dest_loops, uv_layer, loop_indices,
+                                self.copy_seams)
+                bmesh.update_edit_mesh(mesh)
+            else:
+                clipboard.paste_to_mesh(mesh, uv_layer, loop_indices,
+                                        self.copy_seams)
             if self.copy_seams is True:
-                obj.data.show_edge_seams = True
+                mesh.show_edge_seams = True
 
-            self.report(
-                {'INFO'}, "%s's UV coordinates are pasted" % (obj.name))
+            for o in objs:
+                self.report(
+                    {'INFO'}, "%s's UV coordinates are pasted" % (o.name))
+            if not matched:
+                self.report(
+                    {'WARNING'},
+                    "Topology does not match or faces are symmetric; "
+                    "pasted by face order (%s)"
+                    % (mesh.name))
 
         return {'FINISHED'}
 
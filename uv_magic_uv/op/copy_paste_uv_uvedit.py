@@ -55,17 +55,14 @@ class MUV_CPUVIECopyUV(bpy.types.Operator):
         if common.check_version(2, 73, 0) >= 0:
             bm.faces.ensure_lookup_table()
 
-        for face in bm.faces:
-            if not face.select:
-                continue
-            skip = False
-            for l in face.loops:
-                if not l[uv_layer].select:
-                    skip = True
-                    break
-            if skip:
-                continue
-            props.src_uvs.append([l[uv_layer].uv.copy() for l in face.loops])
+        props.clipboard = common.UVClipboard.from_faces(
+            [f for f in bm.faces
+             if f.select and all(l[uv_layer].select for l in f.loops)],
+            uv_layer)
+        try:
+            common.save_uv_clipboard(context, "cpuv", props.clipboard)
+        except OSError as e:
+            self.report({'WARNING'}, "Failed to share copied UV (%s)" % (e))
 
         return {'FINISHED'}
 
@@ -92,6 +89,12 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
         if common.check_version(2, 73, 0) >= 0:
             bm.faces.ensure_lookup_table()
 
+        clipboard = common.load_uv_clipboard(context, "cpuv", props.clipboard)
+        src_uvs = []
+        if clipboard:
+            src_uvs = [[Vector(uv) for uv in uvs]
+                       for uvs in clipboard.get_face_lists()[0]]
+
         dest_uvs = []
         dest_face_indices = []
         for face in bm.faces:
@@ -108,7 +111,7 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
             uvs = [l[uv_layer].uv.copy() for l in face.loops]
             dest_uvs.append(uvs)
 
-        for suvs, duvs in zip(props.src_uvs, dest_uvs):
+        for suvs, duvs in zip(src_uvs, dest_uvs):
             src_diff = suvs[1] - suvs[0]
             dest_diff = duvs[1] - duvs[0]
 
@@ -127,7 +130,7 @@ class MUV_CPUVIEPasteUV(bpy.types.Operator):
             ratio = dest_diff.length / src_diff.length
             break
 
-        for suvs, fidx in zip(props.src_uvs, dest_face_indices):
+        for suvs, fidx in zip(src_uvs, dest_face_indices):
             for l, suv in zip(bm.faces[fidx].loops, suvs):
                 base = suv - src_base
                 radian_ref = atan2(base.y, base.x)
@@ -23,11 +23,10 @@ __status__ = "production"
 __version__ = "5.1"
 __date__ = "24 Feb 2018"
 
-from math import fabs
-
 import bpy
 import bmesh
 import mathutils
+import numpy as np
 from bpy.props import (
     FloatProperty,
     FloatVectorProperty,
@@ -90,33 +89,28 @@ class MUV_PackUV(bpy.types.Operator):
         uv_layer = bm.loops.layers.uv.verify()
 
         selected_faces = [f for f in bm.faces if f.select]
-        island_info = common.get_island_info(obj)
-        num_group = self.__group_island(island_info)
+        island_set = common.get_island_info(obj)
+        groups = self.__group_island(island_set)
 
         loop_lists = [l for f in bm.faces for l in f.loops]
         bpy.ops.mesh.select_all(action='DESELECT')
 
         # pack UV
-        for gidx in range(num_group):
-            group = list(filter(
-                lambda i, idx=gidx: i['group'] == idx, island_info))
-            for f in group[0]['faces']:
-                f['face'].select = True
+        for group in groups:
+            for fidx in group[0][1]:
+                island_set.faces[fidx].select = True
         bmesh.update_edit_mesh(obj.data)
         bpy.ops.uv.select_all(action='SELECT')
         bpy.ops.uv.pack_islands(rotate=self.rotate, margin=self.margin)
 
         # copy/paste UV among same islands
-        for gidx in range(num_group):
-            group = list(filter(
-                lambda i, idx=gidx: i['group'] == idx, island_info))
-            if len(group) <= 1:
-                continue
-            for g in group[1:]:
-                for (src_face, dest_face) in zip(
-                        group[0]['sorted'], g['sorted']):
+        for group in groups:
+            src_faces = group[0][1]
+            for _, dest_faces in group[1:]:
+                for (src_fidx, dest_fidx) in zip(src_faces, dest_faces):
                     for (src_loop, dest_loop) in zip(
-                            src_face['face'].loops, dest_face['face'].loops):
+                            island_set.faces[src_fidx].loops,
+                            island_set.faces[dest_fidx].loops):
                         loop_lists[dest_loop.index][uv_layer].uv = loop_lists[
                             src_loop.index][uv_layer].uv
 
@@ -131,77 +125,60 @@ class MUV_PackUV(bpy.types.Operator):
 
         return {'FINISHED'}
 
-    def __sort_island_faces(self, kd, uvs, isl1, isl2):
+    def __sort_island_faces(self, island_set, src_faces, isl):
         """
-        Sort faces in island
+        Sort faces in island along to faces of source island
         """
 
+        dest_faces = island_set.island_faces(isl).tolist()
+        kd = mathutils.kdtree.KDTree(len(dest_faces))
+        centers = island_set.face_center[dest_faces].tolist()
+        for i, (x, y) in enumerate(centers):
+            kd.insert(Vector((x, y, 0.0)), i)
+        kd.balance()
+
         sorted_faces = []
-        for f in isl1['sorted']:
-            _, idx, _ = kd.find(
-                Vector((f['ave_uv'].x, f['ave_uv'].y, 0.0)))
-            sorted_faces.append(isl2['faces'][uvs[idx]['face_idx']])
+        for x, y in island_set.face_center[src_faces].tolist():
+            _, idx, _ = kd.find(Vector((x, y, 0.0)))
+            sorted_faces.append(dest_faces[idx])
         return sorted_faces
 
-    def __group_island(self, island_info):
+    def __group_island(self, island_set):
         """
         Group island
+        Each group is a list of (island index, face indices), and faces of
+        each island are sorted along to the faces of the first island
         """
 
-        num_group = 0
-        while True:
+        center = island_set.island_center
+        size = island_set.island_size
+        num_uv = island_set.island_num_uv
+        center_dev = np.array(self.allowable_center_deviation)
+        size_dev = np.array(self.allowable_size_deviation)
+
+        island_group = np.full(len(island_set), -1, dtype=np.int64)
+        groups = []
+        for isl_1 in range(len(island_set)):
             # search islands which is not parsed yet
-            isl_1 = None
-            for isl_1 in island_info:
-                if isl_1['group'] == -1:
-                    break
-            else:
-                break   # all faces are parsed
-            if isl_1 is None:
-                break
-            isl_1['group'] = num_group
-            isl_1['sorted'] = isl_1['faces']
+            if island_group[isl_1] != -1:
+                continue
+            island_group[isl_1] = len(groups)
+            src_faces = island_set.island_faces(isl_1).tolist()
+            group = [(isl_1, src_faces)]
 
             # search same island
-            for isl_2 in island_info:
-                if isl_2['group'] == -1:
-                    dcx = isl_2['center'].x - isl_1['center'].x
-                    dcy = isl_2['center'].y - isl_1['center'].y
-                    dsx = isl_2['size'].x - isl_1['size'].x
-                    dsy = isl_2['size'].y - isl_1['size'].y
-                    center_x_matched = (
-                        fabs(dcx) < self.allowable_center_deviation[0]
-                    )
-                    center_y_matched = (
-                        fabs(dcy) < self.allowable_center_deviation[1]
-                    )
-                    size_x_matched = (
-                        fabs(dsx) < self.allowable_size_deviation[0]
-                    )
-                    size_y_matched = (
-                        fabs(dsy) < self.allowable_size_deviation[1]
-                    )
-                    center_matched = center_x_matched and center_y_matched
-                    size_matched = size_x_matched and size_y_matched
-                    num_uv_matched = (isl_2['num_uv'] == isl_1['num_uv'])
-                    # are islands have same?
-                    if center_matched and size_matched and num_uv_matched:
-                        isl_2['group'] = num_group
-                        kd = mathutils.kdtree.KDTree(len(isl_2['faces']))
-                        uvs = [
-                            {
-                                'uv': Vector(
-                                    (f['ave_uv'].x, f['ave_uv'].y, 0.0)
-                                ),
-                                'face_idx': fidx
-                            } for fidx, f in enumerate(isl_2['faces'])
-                        ]
-                        for i, uv in enumerate(uvs):
-                            kd.insert(uv['uv'], i)
-                        kd.balance()
-                        # sort faces for copy/paste UV
-                        isl_2['sorted'] = self.__sort_island_faces(
-                            kd, uvs, isl_1, isl_2)
-            num_group = num_group + 1
-
-        return num_group
+            center_matched = np.all(
+                np.fabs(center - center[isl_1]) < center_dev, axis=1)
+            size_matched = np.all(
+                np.fabs(size - size[isl_1]) < size_dev, axis=1)
+            num_uv_matched = num_uv == num_uv[isl_1]
+            matched = (island_group == -1) & center_matched & \
+                size_matched & num_uv_matched
+            for isl_2 in np.nonzero(matched)[0].tolist():
+                island_group[isl_2] = len(groups)
+                # sort faces for copy/paste UV
+                group.append((isl_2, self.__sort_island_faces(
+                    island_set, src_faces, isl_2)))
+            groups.append(group)
+
+        return groups
@@ -25,7 +25,8 @@ __date__ = "24 Feb 2018"
 
 import bpy
 import bmesh
-from bpy.props import BoolProperty, FloatProperty
+from bpy.props import BoolProperty, FloatProperty, IntProperty
+import numpy as np
 
 from .. import common
 
@@ -54,145 +55,90 @@ class MUV_AUVSmooth(bpy.types.Operator):
         description="Select UVs which are smoothed",
         default=False
     )
+    multiple = BoolProperty(
+        name="Multiple",
+        description="Smooth all selected UV loop sequences",
+        default=False
+    )
+    iterations = IntProperty(
+        name="Iterations",
+        description="Number of times to smooth",
+        min=1,
+        max=100,
+        default=1
+    )
 
     @classmethod
     def poll(cls, context):
         return context.mode == 'EDIT_MESH'
 
-    def __smooth_wo_transmission(self, loop_seqs, uv_layer):
-        # calculate path length
-        loops = []
-        for hseq in loop_seqs:
-            loops.extend([hseq[0][0], hseq[0][1]])
-        full_vlen = 0
-        accm_vlens = [0.0]
-        full_uvlen = 0
-        accm_uvlens = [0.0]
-        orig_uvs = [loop_seqs[0][0][0][uv_layer].uv.copy()]
-        for l1, l2 in zip(loops[:-1], loops[1:]):
-            diff_v = l2.vert.co - l1.vert.co
-            full_vlen = full_vlen + diff_v.length
-            accm_vlens.append(full_vlen)
-            diff_uv = l2[uv_layer].uv - l1[uv_layer].uv
-            full_uvlen = full_uvlen + diff_uv.length
-            accm_uvlens.append(full_uvlen)
-            orig_uvs.append(l2[uv_layer].uv.copy())
-
-        for hidx, hseq in enumerate(loop_seqs):
-            pair = hseq[0]
-            for pidx, l in enumerate(pair):
-                if self.select:
-                    l[uv_layer].select = True
-
-                # ignore start/end loop
-                if (hidx == 0 and pidx == 0) or\
-                   ((hidx == len(loop_seqs) - 1) and (pidx == len(pair) - 1)):
-                    continue
-
-                # calculate target path length
-                # target = no influenced * (1 - infl) + influenced * infl
-                tgt_noinfl = full_uvlen * (hidx + pidx) / (len(loop_seqs))
-                tgt_infl = full_uvlen * accm_vlens[hidx * 2 + pidx] / full_vlen
-                target_length = tgt_noinfl * (1 - self.mesh_infl) + \
-                    tgt_infl * self.mesh_infl
-
-                # get target UV
-                for i in range(len(accm_uvlens[:-1])):
-                    # get line segment which UV will be placed
-                    if ((accm_uvlens[i] <= target_length) and
-                            (accm_uvlens[i + 1] > target_length)):
-                        tgt_seg_len = target_length - accm_uvlens[i]
-                        seg_len = accm_uvlens[i + 1] - accm_uvlens[i]
-                        uv1 = orig_uvs[i]
-                        uv2 = orig_uvs[i + 1]
-                        target_uv = uv1 + (uv2 - uv1) * tgt_seg_len / seg_len
-                        break
-                else:
-                    self.report({'ERROR'}, "Failed to get target UV")
-                    return {'CANCELLED'}
-
-                # update UV
-                l[uv_layer].uv = target_uv
+    # smooth UVs along the sequence of loop pairs
+    # smoothed UVs are stored in staged_uvs, and not written to the loops
+    # return False if target UV is not found
+    def __smooth_pairs(self, pairs, uv_layer, staged_uvs):
+        loops = [l for pair in pairs for l in pair]
+        vs = np.array([l.vert.co.to_tuple() for l in loops])
+        uvs = np.array([staged_uvs[l] if l in staged_uvs
+                        else l[uv_layer].uv.to_tuple() for l in loops])
 
-    def __smooth_w_transmission(self, loop_seqs, uv_layer):
         # calculate path length
-        loops = []
+        accm_vlens = np.zeros(len(loops))
+        accm_vlens[1:] = np.cumsum(np.linalg.norm(np.diff(vs, axis=0), axis=1))
+        full_vlen = accm_vlens[-1]
+        accm_uvlens = np.zeros(len(loops))
+        accm_uvlens[1:] = np.cumsum(
+            np.linalg.norm(np.diff(uvs, axis=0), axis=1))
+        full_uvlen = accm_uvlens[-1]
+
+        # ignore start/end loop
+        hidx = np.repeat(np.arange(len(pairs)), [len(p) for p in pairs])[1:-1]
+        pidx = np.concatenate([np.arange(len(p)) for p in pairs])[1:-1]
+
+        # calculate target path length
+        # target = no influenced * (1 - infl) + influenced * infl
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tgt_noinfl = full_uvlen * (hidx + pidx) / len(pairs)
+            tgt_infl = full_uvlen * accm_vlens[hidx * 2 + pidx] / full_vlen
+            target_lens = tgt_noinfl * (1 - self.mesh_infl) + \
+                tgt_infl * self.mesh_infl
+
+            # get line segment which UV will be placed
+            seg = np.searchsorted(accm_uvlens, target_lens, side='right') - 1
+            if np.any(seg < 0) or np.any(seg >= len(loops) - 1):
+                return False
+            seg_lens = accm_uvlens[seg + 1] - accm_uvlens[seg]
+            rates = (target_lens - accm_uvlens[seg]) / seg_lens
+            target_uvs = uvs[seg] + (uvs[seg + 1] - uvs[seg]) * rates[:, None]
+        if not np.all(np.isfinite(target_uvs)):
+            return False
+
+        # update UV
+        for l, uv in zip(loops[1:-1], target_uvs.tolist()):
+            staged_uvs[l] = uv
+        for l in (loops[0], loops[-1]):
+            staged_uvs.setdefault(l, l[uv_layer].uv.to_tuple())
+
+        return True
+
+    def __smooth_wo_transmission(self, loop_seqs, uv_layer, staged_uvs):
+        # only the selected loop pairs are smoothed
+        pairs = [hseq[0] for hseq in loop_seqs]
+        return self.__smooth_pairs(pairs, uv_layer, staged_uvs)
+
+    def __smooth_w_transmission(self, loop_seqs, uv_layer, staged_uvs):
         for vidx in range(len(loop_seqs[0])):
-            ls = []
-            for hseq in loop_seqs:
-                ls.extend(hseq[vidx])
-            loops.append(ls)
-
-        orig_uvs = []
-        accm_vlens = []
-        full_vlens = []
-        accm_uvlens = []
-        full_uvlens = []
-        for ls in loops:
-            full_v = 0.0
-            accm_v = [0.0]
-            full_uv = 0.0
-            accm_uv = [0.0]
-            uvs = [ls[0][uv_layer].uv.copy()]
-            for l1, l2 in zip(ls[:-1], ls[1:]):
-                diff_v = l2.vert.co - l1.vert.co
-                full_v = full_v + diff_v.length
-                accm_v.append(full_v)
-                diff_uv = l2[uv_layer].uv - l1[uv_layer].uv
-                full_uv = full_uv + diff_uv.length
-                accm_uv.append(full_uv)
-                uvs.append(l2[uv_layer].uv.copy())
-            accm_vlens.append(accm_v)
-            full_vlens.append(full_v)
-            accm_uvlens.append(accm_uv)
-            full_uvlens.append(full_uv)
-            orig_uvs.append(uvs)
-
-        for hidx, hseq in enumerate(loop_seqs):
-            for vidx, (pair, uvs, accm_v, full_v, accm_uv, full_uv)\
-                    in enumerate(zip(hseq, orig_uvs, accm_vlens, full_vlens,
-                                     accm_uvlens, full_uvlens)):
-                for pidx, l in enumerate(pair):
-                    if self.select:
-                        l[uv_layer].select = True
-
-                    # ignore start/end loop
-                    if hidx == 0 and pidx == 0:
-                        continue
-                    if hidx == len(loop_seqs) - 1 and pidx == len(pair) - 1:
-                        continue
-
-                    # calculate target path length
-                    # target = no influenced * (1 - infl) + influenced * infl
-                    tgt_noinfl = full_uv * (hidx + pidx) / (len(loop_seqs))
-                    tgt_infl = full_uv * accm_v[hidx * 2 + pidx] / full_v
-                    target_length = tgt_noinfl * (1 - self.mesh_infl) + \
-                        tgt_infl * self.mesh_infl
-
-                    # get target UV
-                    for i in range(len(accm_uv[:-1])):
-                        # get line segment to be placed
-                        if ((accm_uv[i] <= target_length) and
-                                (accm_uv[i + 1] > target_length)):
-                            tgt_seg_len = target_length - accm_uv[i]
-                            seg_len = accm_uv[i + 1] - accm_uv[i]
-                            uv1 = uvs[i]
-                            uv2 = uvs[i + 1]
-                            target_uv = uv1 +\
-                                (uv2 - uv1) * tgt_seg_len / seg_len
-                            break
-                    else:
-                        self.report({'ERROR'}, "Failed to get target UV")
-                        return {'CANCELLED'}
-
-                    # update UV
-                    l[uv_layer].uv = target_uv
-
-    def __smooth(self, loop_seqs, uv_layer):
+            pairs = [hseq[vidx] for hseq in loop_seqs]
+            if not self.__smooth_pairs(pairs, uv_layer, staged_uvs):
+                return False
+
+        return True
+
+    def __smooth(self, loop_seqs, uv_layer, staged_uvs):
         if self.transmission:
-            self.__smooth_w_transmission(loop_seqs, uv_layer)
-        else:
-            self.__smooth_wo_transmission(loop_seqs, uv_layer)
+            return self.__smooth_w_transmission(loop_seqs, uv_layer,
+                                                staged_uvs)
+        return self.__smooth_wo_transmission(loop_seqs, uv_layer,
+                                             staged_uvs)
 
     def execute(self, context):
         obj = context.active_object
@@ -201,14 +147,26 @@ class MUV_AUVSmooth(bpy.types.Operator):
             bm.faces.ensure_lookup_table()
         uv_layer = bm.loops.layers.uv.verify()
 
-        # loop_seqs[horizontal][vertical][loop]
-        loop_seqs, error = common.get_loop_sequences(bm, uv_layer)
-        if not loop_seqs:
+        # all_loop_seqs[sequence][horizontal][vertical][loop]
+        all_loop_seqs, error = common.get_loop_sequences_list(
+            bm, uv_layer, self.multiple, mesh=obj.data)
+        if not all_loop_seqs:
             self.report({'WARNING'}, error)
             return {'CANCELLED'}
 
-        # smooth
-        self.__smooth(loop_seqs, uv_layer)
+        # smooth, UVs are not changed until all sequences are smoothed
+        staged_uvs = {}
+        for _ in range(self.iterations):
+            for loop_seqs in all_loop_seqs:
+                if not self.__smooth(loop_seqs, uv_layer, staged_uvs):
+                    self.report({'ERROR'}, "Failed to get target UV")
+                    return {'CANCELLED'}
+
+        # update UV
+        for l, uv in staged_uvs.items():
+            l[uv_layer].uv = uv
+            if self.select:
+                l[uv_layer].select = True
 
         bmesh.update_edit_mesh(obj.data)
 
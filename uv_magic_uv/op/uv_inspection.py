@@ -23,299 +23,304 @@ __status__ = "production"
 __version__ = "5.1"
 __date__ = "24 Feb 2018"
 
+import threading
+
 import bpy
 import bmesh
 import bgl
+from bpy.props import IntProperty
 from mathutils import Vector
+import numpy as np
 
 from .. import common
 
 
-def is_polygon_same(points1, points2):
-    if len(points1) != len(points2):
-        return False
-
-    pts1 = points1.as_list()
-    pts2 = points2.as_list()
-
-    for p1 in pts1:
-        for p2 in pts2:
-            diff = p2 - p1
-            if diff.length < 0.0000001:
-                pts2.remove(p2)
-                break
-        else:
-            return False
-
-    return True
-
-
-def is_segment_intersect(start1, end1, start2, end2):
-    seg1 = end1 - start1
-    seg2 = end2 - start2
-
-    a1 = -seg1.y
-    b1 = seg1.x
-    d1 = -(a1 * start1.x + b1 * start1.y)
-
-    a2 = -seg2.y
-    b2 = seg2.x
-    d2 = -(a2 * start2.x + b2 * start2.y)
-
-    seg1_line2_start = a2 * start1.x + b2 * start1.y + d2
-    seg1_line2_end = a2 * end1.x + b2 * end1.y + d2
-
-    seg2_line1_start = a1 * start2.x + b1 * start2.y + d1
-    seg2_line1_end = a1 * end2.x + b1 * end2.y + d1
+# maximum number of vertices when the triangle is clipped by the triangle
+MAX_CLIPPED_VERTS = 9
 
-    if (seg1_line2_start * seg1_line2_end >= 0) or \
-            (seg2_line1_start * seg2_line1_end >= 0):
-        return False, None
 
-    u = seg1_line2_start / (seg1_line2_start - seg1_line2_end)
-    out = start1 + u * seg1
+def __cross(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
 
-    return True, out
 
+def get_polygon_area(xs, ys, num):
+    """
+    Get signed area of the polygon (counter-clockwise is positive)
+    """
 
-class RingBuffer:
-    def __init__(self, arr):
-        self.__buffer = arr.copy()
-        self.__pointer = 0
-
-    def __repr__(self):
-        return repr(self.__buffer)
-
-    def __len__(self):
-        return len(self.__buffer)
-
-    def insert(self, val, offset=0):
-        self.__buffer.insert(self.__pointer + offset, val)
+    area = 0.0
+    for i in range(num):
+        j = (i + 1) % num
+        area = area + xs[i] * ys[j] - ys[i] * xs[j]
 
-    def head(self):
-        return self.__buffer[0]
+    return 0.5 * area
 
-    def tail(self):
-        return self.__buffer[-1]
 
-    def get(self, offset=0):
-        size = len(self.__buffer)
-        val = self.__buffer[(self.__pointer + offset) % size]
-        return val
+def triangulate_polygon(xs, ys):
+    """
+    Triangulate counter-clockwise polygon
+    Convex polygon is triangulated as fan, otherwise by ear clipping
+    """
 
-    def next(self):
-        size = len(self.__buffer)
-        self.__pointer = (self.__pointer + 1) % size
+    num = len(xs)
+    convex = True
+    for i in range(num):
+        if __cross(xs[i - 1], ys[i - 1], xs[i], ys[i],
+                   xs[(i + 1) % num], ys[(i + 1) % num]) < 0.0:
+            convex = False
+            break
+    if convex:
+        return [(0, i, i + 1) for i in range(1, num - 1)]
+
+    tris = []
+    rest = list(range(num))
+    while len(rest) > 3:
+        n = len(rest)
+        for k in range(n):
+            i0, i1, i2 = rest[k - 1], rest[k], rest[(k + 1) % n]
+            # reflex vertex is not an ear
+            if __cross(xs[i0], ys[i0], xs[i1], ys[i1], xs[i2], ys[i2]) <= 0.0:
+                continue
+            # ear must not contain other vertices
+            for j in rest:
+                if j in (i0, i1, i2):
+                    continue
+                if __cross(xs[i0], ys[i0], xs[i1], ys[i1],
+                           xs[j], ys[j]) >= 0.0 and \
+                   __cross(xs[i1], ys[i1], xs[i2], ys[i2],
+                           xs[j], ys[j]) >= 0.0 and \
+                   __cross(xs[i2], ys[i2], xs[i0], ys[i0],
+                           xs[j], ys[j]) >= 0.0:
+                    break
+            else:
+                tris.append((i0, i1, i2))
+                del rest[k]
+                break
+        else:
+            # self-intersected polygon, triangulate the rest as fan
+            break
+    tris.extend([(rest[0], rest[i], rest[i + 1])
+                 for i in range(1, len(rest) - 1)])
 
-    def reset(self):
-        self.__pointer = 0
+    return tris
 
-    def find(self, obj):
-        try:
-            idx = self.__buffer.index(obj)
-        except ValueError:
-            return None
-        return self.__buffer[idx]
 
-    def find_and_next(self, obj):
-        size = len(self.__buffer)
-        idx = self.__buffer.index(obj)
-        self.__pointer = (idx + 1) % size
+def clip_triangle(clip, subject, buf):
+    """
+    Clip triangle by triangle with Sutherland-Hodgman algorithm
+    Both triangles are counter-clockwise tuple (x0, y0, x1, y1, x2, y2).
+    buf is preallocated buffers [xs1, ys1, xs2, ys2] whose length is
+    MAX_CLIPPED_VERTS, and the clipped polygon is returned as
+    (xs, ys, number of vertices)
+    """
 
-    def find_and_set(self, obj):
-        idx = self.__buffer.index(obj)
-        self.__pointer = idx
+    in_xs, in_ys, out_xs, out_ys = buf
+    in_xs[0], in_xs[1], in_xs[2] = subject[0], subject[2], subject[4]
+    in_ys[0], in_ys[1], in_ys[2] = subject[1], subject[3], subject[5]
+    num = 3
+
+    for e in range(3):
+        ax, ay = clip[e * 2], clip[e * 2 + 1]
+        bx, by = clip[(e * 2 + 2) % 6], clip[(e * 2 + 3) % 6]
+        ex = bx - ax
+        ey = by - ay
+        out_num = 0
+        px, py = in_xs[num - 1], in_ys[num - 1]
+        pd = ex * (py - ay) - ey * (px - ax)
+        for i in range(num):
+            cx, cy = in_xs[i], in_ys[i]
+            cd = ex * (cy - ay) - ey * (cx - ax)
+            if (cd >= 0.0) != (pd >= 0.0):
+                # edge crosses the clip line
+                t = pd / (pd - cd)
+                out_xs[out_num] = px + (cx - px) * t
+                out_ys[out_num] = py + (cy - py) * t
+                out_num = out_num + 1
+            if cd >= 0.0:
+                out_xs[out_num] = cx
+                out_ys[out_num] = cy
+                out_num = out_num + 1
+            px, py, pd = cx, cy, cd
+        in_xs, in_ys, out_xs, out_ys = out_xs, out_ys, in_xs, in_ys
+        num = out_num
+        if num < 3:
+            return in_xs, in_ys, 0
+
+    return in_xs, in_ys, num
+
+
+def get_uv_polygon(isl, fidx):
+    """
+    Get counter-clockwise UV polygon of the face in the island set as
+    coordinate lists
+    """
 
-    def as_list(self):
-        return self.__buffer.copy()
+    start = isl.face_start[fidx]
+    uvs = isl.uvs[start:start + isl.face_size[fidx]]
+    xs = uvs[:, 0].tolist()
+    ys = uvs[:, 1].tolist()
+    if get_polygon_area(xs, ys, len(xs)) < 0.0:
+        xs.reverse()
+        ys.reverse()
 
-    def reverse(self):
-        self.__buffer.reverse()
-        self.reset()
+    return xs, ys
 
 
 # clip: reference polygon
 # subject: tested polygon
-def do_weiler_atherton_cliping(clip, subject, uv_layer, mode):
-
-    clip_uvs = RingBuffer([l[uv_layer].uv.copy() for l in clip.loops])
-    if is_polygon_flipped(clip_uvs):
-        clip_uvs.reverse()
-    subject_uvs = RingBuffer([l[uv_layer].uv.copy() for l in subject.loops])
-    if is_polygon_flipped(subject_uvs):
-        subject_uvs.reverse()
-
-    common.debug_print("===== Clip UV List =====")
-    common.debug_print(clip_uvs)
-    common.debug_print("===== Subject UV List =====")
-    common.debug_print(subject_uvs)
-
-    # check if clip and subject is overlapped completely
-    if is_polygon_same(clip_uvs, subject_uvs):
-        polygons = [subject_uvs.as_list()]
-        common.debug_print("===== Polygons Overlapped Completely =====")
-        common.debug_print(polygons)
-        return True, polygons
-
-    # check if subject is in clip
-    if is_points_in_polygon(subject_uvs, clip_uvs):
-        polygons = [subject_uvs.as_list()]
-        return True, polygons
-
-    # check if clip is in subject
-    if is_points_in_polygon(clip_uvs, subject_uvs):
-        polygons = [subject_uvs.as_list()]
-        return True, polygons
-
-    # check if clip and subject is overlapped partially
-    intersections = []
-    while True:
-        subject_uvs.reset()
-        while True:
-            uv_start1 = clip_uvs.get()
-            uv_end1 = clip_uvs.get(1)
-            uv_start2 = subject_uvs.get()
-            uv_end2 = subject_uvs.get(1)
-            intersected, point = is_segment_intersect(uv_start1, uv_end1,
-                                                      uv_start2, uv_end2)
-            if intersected:
-                clip_uvs.insert(point, 1)
-                subject_uvs.insert(point, 1)
-                intersections.append([point,
-                                      [clip_uvs.get(), clip_uvs.get(1)]])
-            subject_uvs.next()
-            if subject_uvs.get() == subject_uvs.head():
-                break
-        clip_uvs.next()
-        if clip_uvs.get() == clip_uvs.head():
-            break
+# polygons are returned as the list of (x, y) with the overlapped area
+# (in FACE mode, area is measured until the first overlapped part is found)
+def do_triangle_cliping(clip_xs, clip_ys, subject_xs, subject_ys, mode):
+    clip_area = get_polygon_area(clip_xs, clip_ys, len(clip_xs))
+    subject_area = get_polygon_area(subject_xs, subject_ys, len(subject_xs))
+
+    # overlapped area smaller than tolerance is ignored (ex. common edge)
+    tolerance = min(clip_area, subject_area) * 0.000001
+    if tolerance <= 0.0:
+        return False, None, 0.0
+
+    clip_tris = [(clip_xs[i0], clip_ys[i0], clip_xs[i1], clip_ys[i1],
+                  clip_xs[i2], clip_ys[i2])
+                 for i0, i1, i2 in triangulate_polygon(clip_xs, clip_ys)]
+    subject_tris = [(subject_xs[i0], subject_ys[i0], subject_xs[i1],
+                     subject_ys[i1], subject_xs[i2], subject_ys[i2])
+                    for i0, i1, i2
+                    in triangulate_polygon(subject_xs, subject_ys)]
+    subject_polygon = list(zip(subject_xs, subject_ys))
+
+    buf = [[0.0] * MAX_CLIPPED_VERTS for _ in range(4)]
+    polygons = []
+    overlapped_area = 0.0
+    for ct in clip_tris:
+        for st in subject_tris:
+            # fast operation, apply bounding box algorithm
+            if max(ct[0], ct[2], ct[4]) < min(st[0], st[2], st[4]) or \
+               max(st[0], st[2], st[4]) < min(ct[0], ct[2], ct[4]) or \
+               max(ct[1], ct[3], ct[5]) < min(st[1], st[3], st[5]) or \
+               max(st[1], st[3], st[5]) < min(ct[1], ct[3], ct[5]):
+                continue
+            xs, ys, num = clip_triangle(ct, st, buf)
+            if num == 0:
+                continue
+            area = get_polygon_area(xs, ys, num)
+            if area <= tolerance:
+                continue
+            # only the overlapped face is needed
+            if mode == 'FACE':
+                return True, [subject_polygon], area
+            polygons.append(list(zip(xs[:num], ys[:num])))
+            overlapped_area = overlapped_area + area
 
-    common.debug_print("===== Intersection List =====")
-    common.debug_print(intersections)
+    if overlapped_area <= tolerance:
+        return False, None, 0.0
 
-    # no intersection, so subject and clip is not overlapped
-    if not intersections:
-        return False, None
+    # subject is in clip, or clip is in subject
+    if abs(overlapped_area - subject_area) <= tolerance or \
+       abs(overlapped_area - clip_area) <= tolerance:
+        return True, [subject_polygon], overlapped_area
 
-    def get_intersection_pair(intersections, key):
-        for sect in intersections:
-            if sect[0] == key:
-                return sect[1]
+    return True, polygons, overlapped_area
 
-        return None
 
-    # make enter/exit pair
-    subject_uvs.reset()
-    subject_entering = []
-    subject_exiting = []
-    clip_entering = []
-    clip_exiting = []
-    intersect_uv_list = []
-    while True:
-        pair = get_intersection_pair(intersections, subject_uvs.get())
-        if pair:
-            sub = subject_uvs.get(1) - subject_uvs.get(-1)
-            inter = pair[1] - pair[0]
-            cross = sub.x * inter.y - inter.x * sub.y
-            if cross < 0:
-                subject_entering.append(subject_uvs.get())
-                clip_exiting.append(subject_uvs.get())
-            else:
-                subject_exiting.append(subject_uvs.get())
-                clip_entering.append(subject_uvs.get())
-            intersect_uv_list.append(subject_uvs.get())
+def get_triangle_fan_verts(points, poly_start, poly_size):
+    """
+    Triangulate polygons like GL_TRIANGLE_FAN at once
+    Polygons are given as the flat array of 2D points and the start/size of
+    each polygon. Vertices of triangles are returned as (N * 3, 2) array
+    """
 
-        subject_uvs.next()
-        if subject_uvs.get() == subject_uvs.head():
-            break
+    num_tris = np.maximum(poly_size - 2, 0)
+    total = int(num_tris.sum())
+    if total == 0:
+        return np.empty((0, 2), dtype=np.float32)
 
-    common.debug_print("===== Enter List =====")
-    common.debug_print(clip_entering)
-    common.debug_print(subject_entering)
-    common.debug_print("===== Exit List =====")
-    common.debug_print(clip_exiting)
-    common.debug_print(subject_exiting)
-
-    # for now, can't handle the situation when fulfill all below conditions
-    #        * two faces have common edge
-    #        * each face is intersected
-    #        * Show Mode is "Part"
-    #       so for now, ignore this situation
-    if len(subject_entering) != len(subject_exiting):
-        if mode == 'FACE':
-            polygons = [subject_uvs.as_list()]
-            return True, polygons
-        return False, None
-
-    def traverse(current_list, entering, exiting, poly, current, other_list):
-        result = current_list.find(current)
-        if not result:
-            return None
-        if result != current:
-            print("Internal Error")
-            return None
-
-        # enter
-        if entering.count(current) >= 1:
-            entering.remove(current)
-
-        current_list.find_and_next(current)
-        current = current_list.get()
-
-        while exiting.count(current) == 0:
-            poly.append(current.copy())
-            current_list.find_and_next(current)
-            current = current_list.get()
-
-        # exit
-        poly.append(current.copy())
-        exiting.remove(current)
-
-        other_list.find_and_set(current)
-        return other_list.get()
-
-    # Traverse
-    polygons = []
-    current_uv_list = subject_uvs
-    other_uv_list = clip_uvs
-    current_entering = subject_entering
-    current_exiting = subject_exiting
-
-    poly = []
-    current_uv = current_entering[0]
-
-    while True:
-        current_uv = traverse(current_uv_list, current_entering,
-                              current_exiting, poly, current_uv, other_uv_list)
-
-        if current_uv_list == subject_uvs:
-            current_uv_list = clip_uvs
-            other_uv_list = subject_uvs
-            current_entering = clip_entering
-            current_exiting = clip_exiting
-            common.debug_print("-- Next: Clip --")
-        else:
-            current_uv_list = subject_uvs
-            other_uv_list = clip_uvs
-            current_entering = subject_entering
-            current_exiting = subject_exiting
-            common.debug_print("-- Next: Subject --")
-
-        common.debug_print(clip_entering)
-        common.debug_print(clip_exiting)
-        common.debug_print(subject_entering)
-        common.debug_print(subject_exiting)
-
-        if not clip_entering and not clip_exiting \
-                and not subject_entering and not subject_exiting:
-            break
+    first = np.repeat(poly_start, num_tris)
+    tri_start = np.cumsum(num_tris) - num_tris
+    second = first + np.arange(total) - np.repeat(tri_start, num_tris) + 1
+    indices = np.stack([first, second, second + 1], axis=1).ravel()
 
-    polygons.append(poly)
+    return np.asarray(points, dtype=np.float32)[indices]
 
-    common.debug_print("===== Polygons Overlapped Partially =====")
-    common.debug_print(polygons)
 
-    return True, polygons
+class UVInspDrawBuffer:
+    """
+    Triangulated UVs of overlapped/flipped UVs to render
+    Triangles are built and compiled into the display list only when the
+    results are added or replaced, and the display list is mapped to the
+    region by one view transform per frame
+    """
+
+    def __init__(self, overlapped):
+        self.__overlapped = overlapped
+        self.__result = None
+        self.__mode = None
+        self.__num_info = 0
+        self.__verts = np.empty((0, 2), dtype=np.float32)
+        self.__gl_list = None
+        self.__compiled = False
+
+    def update(self, result, mode):
+        if self.__overlapped:
+            num_info = len(result.overlapped)
+        else:
+            num_info = len(result.flipped)
+        if (result is not self.__result or mode != self.__mode
+                or num_info < self.__num_info):
+            self.__result = result
+            self.__mode = mode
+            self.__num_info = 0
+            self.__verts = np.empty((0, 2), dtype=np.float32)
+            self.__compiled = False
+
+        # results may be added progressively by the background analysis
+        if num_info == self.__num_info:
+            return
+        points = []
+        sizes = []
+        for i in range(self.__num_info, num_info):
+            if self.__overlapped:
+                polygons = result.get_overlapped_polygons(i, mode)
+            else:
+                polygons = result.get_flipped_polygons(i)
+            for poly in polygons:
+                points.extend(poly)
+                sizes.append(len(poly))
+        if points:
+            sizes = np.array(sizes, dtype=np.int64)
+            tris = get_triangle_fan_verts(
+                np.array(points, dtype=np.float64).reshape(-1, 2),
+                np.cumsum(sizes) - sizes, sizes)
+            self.__verts = np.concatenate([self.__verts, tris])
+            self.__compiled = False
+        self.__num_info = num_info
+
+    def __compile(self):
+        if self.__gl_list is None:
+            self.__gl_list = bgl.glGenLists(1)
+        bgl.glNewList(self.__gl_list, bgl.GL_COMPILE)
+        bgl.glBegin(bgl.GL_TRIANGLES)
+        for x, y in self.__verts.tolist():
+            bgl.glVertex2f(x, y)
+        bgl.glEnd()
+        bgl.glEndList()
+        self.__compiled = True
+
+    def free(self):
+        if self.__gl_list is not None:
+            bgl.glDeleteLists(self.__gl_list, 1)
+            self.__gl_list = None
+        self.__compiled = False
+
+    def draw(self, color):
+        if len(self.__verts) == 0:
+            return
+
+        # vertices are sent only when the triangles are changed
+        if not self.__compiled:
+            self.__compile()
+
+        bgl.glColor4f(color[0], color[1], color[2], color[3])
+        bgl.glCallList(self.__gl_list)
 
 
 class MUV_UVInspRenderer(bpy.types.Operator):
@@ -329,9 +334,13 @@ class MUV_UVInspRenderer(bpy.types.Operator):
     bl_label = "Overlapped/Flipped UV renderer"
 
     __handle = None
+    __overlapped_buffer = None
+    __flipped_buffer = None
 
     @staticmethod
     def handle_add(obj, context):
+        MUV_UVInspRenderer.__overlapped_buffer = UVInspDrawBuffer(True)
+        MUV_UVInspRenderer.__flipped_buffer = UVInspDrawBuffer(False)
         sie = bpy.types.SpaceImageEditor
         MUV_UVInspRenderer.__handle = sie.draw_handler_add(
             MUV_UVInspRenderer.draw, (obj, context), 'WINDOW', 'POST_PIXEL')
@@ -342,155 +351,540 @@ class MUV_UVInspRenderer(bpy.types.Operator):
             bpy.types.SpaceImageEditor.draw_handler_remove(
                 MUV_UVInspRenderer.__handle, 'WINDOW')
             MUV_UVInspRenderer.__handle = None
+        for buf in (MUV_UVInspRenderer.__overlapped_buffer,
+                    MUV_UVInspRenderer.__flipped_buffer):
+            if buf is not None:
+                buf.free()
+        MUV_UVInspRenderer.__overlapped_buffer = None
+        MUV_UVInspRenderer.__flipped_buffer = None
 
     @staticmethod
     def draw(_, context):
         sc = context.scene
         props = sc.muv_props.uvinsp
         prefs = context.user_preferences.addons["uv_magic_uv"].preferences
+        overlapped_buffer = MUV_UVInspRenderer.__overlapped_buffer
+        flipped_buffer = MUV_UVInspRenderer.__flipped_buffer
+        if overlapped_buffer is None or flipped_buffer is None:
+            return
+        if props.result is None:
+            return
+
+        # UV space is mapped to the region by scale and translation
+        view2d = context.region.view2d
+        ox, oy = view2d.view_to_region(0.0, 0.0, clip=False)
+        ux, uy = view2d.view_to_region(1.0, 1.0, clip=False)
 
         # OpenGL configuration
         bgl.glEnable(bgl.GL_BLEND)
+        bgl.glMatrixMode(bgl.GL_MODELVIEW)
+        bgl.glPushMatrix()
+        bgl.glTranslatef(ox, oy, 0.0)
+        bgl.glScalef(ux - ox, uy - oy, 1.0)
 
         # render overlapped UV
         if sc.muv_uvinsp_show_overlapped:
-            color = prefs.uvinsp_overlapped_color
-            for info in props.overlapped_info:
-                if sc.muv_uvinsp_show_mode == 'PART':
-                    for poly in info["polygons"]:
-                        bgl.glBegin(bgl.GL_TRIANGLE_FAN)
-                        bgl.glColor4f(color[0], color[1], color[2], color[3])
-                        for uv in poly:
-                            x, y = context.region.view2d.view_to_region(
-                                uv.x, uv.y)
-                            bgl.glVertex2f(x, y)
-                        bgl.glEnd()
-                elif sc.muv_uvinsp_show_mode == 'FACE':
-                    bgl.glBegin(bgl.GL_TRIANGLE_FAN)
-                    bgl.glColor4f(color[0], color[1], color[2], color[3])
-                    for uv in info["subject_uvs"]:
-                        x, y = context.region.view2d.view_to_region(uv.x, uv.y)
-                        bgl.glVertex2f(x, y)
-                    bgl.glEnd()
+            overlapped_buffer.update(props.result, sc.muv_uvinsp_show_mode)
+            overlapped_buffer.draw(prefs.uvinsp_overlapped_color)
 
         # render flipped UV
         if sc.muv_uvinsp_show_flipped:
-            color = prefs.uvinsp_flipped_color
-            for info in props.flipped_info:
-                if sc.muv_uvinsp_show_mode == 'PART':
-                    for poly in info["polygons"]:
-                        bgl.glBegin(bgl.GL_TRIANGLE_FAN)
-                        bgl.glColor4f(color[0], color[1], color[2], color[3])
-                        for uv in poly:
-                            x, y = context.region.view2d.view_to_region(
-                                uv.x, uv.y)
-                            bgl.glVertex2f(x, y)
-                        bgl.glEnd()
-                elif sc.muv_uvinsp_show_mode == 'FACE':
-                    bgl.glBegin(bgl.GL_TRIANGLE_FAN)
-                    bgl.glColor4f(color[0], color[1], color[2], color[3])
-                    for uv in info["uvs"]:
-                        x, y = context.region.view2d.view_to_region(uv.x, uv.y)
-                        bgl.glVertex2f(x, y)
-                    bgl.glEnd()
-
-
-def is_polygon_flipped(points):
-    area = 0.0
-    for i in range(len(points)):
-        uv1 = points.get(i)
-        uv2 = points.get(i + 1)
-        a = uv1.x * uv2.y - uv1.y * uv2.x
-        area = area + a
-    if area < 0:
-        # clock-wise
-        return True
-    return False
+            flipped_buffer.update(props.result, sc.muv_uvinsp_show_mode)
+            flipped_buffer.draw(prefs.uvinsp_flipped_color)
+
+        bgl.glPopMatrix()
+
+
+def get_kept_candidates(moved, candidates):
+    """
+    Get indices of candidates which do not include the moved faces
+    """
+
+    return np.nonzero(~(moved[candidates[:, 0]] |
+                        moved[candidates[:, 1]]))[0]
+
+
+def get_candidate_face_pairs(isl, moved=None, candidates=None):
+    """
+    Get face pairs (i < j) which may be overlapped
+    If faces moved from the last inspection and its candidates are given,
+    only the pairs which include the moved faces are searched again, and
+    the kept candidates (see get_kept_candidates) come first
+    """
+
+    # find overlapped faces by bounding box
+    # faces in the same island are also checked to find folded-over regions
+    if moved is None:
+        face_pairs = common.get_overlapped_aabb_pairs(isl.face_min,
+                                                      isl.face_max)
+    else:
+        face_pairs = common.get_overlapped_aabb_pairs_of(
+            isl.face_min, isl.face_max, np.nonzero(moved)[0])
+
+    # faces which share the UV edge are not overlapped
+    num_faces = len(isl.face_island)
+    adjacent = isl.uv_edge_face_pairs()
+    adjacent = adjacent[:, 0] * num_faces + adjacent[:, 1]
+    face_pairs = face_pairs[~np.isin(
+        face_pairs[:, 0] * num_faces + face_pairs[:, 1], adjacent)]
+
+    if moved is not None:
+        kept = get_kept_candidates(moved, candidates)
+        face_pairs = np.concatenate((candidates[kept], face_pairs))
+
+    return face_pairs
+
+
+def get_overlapped_face_pairs(isl, candidates=None, return_index=False):
+    """
+    Get face pairs (clip, subject) which may be overlapped
+    If return_index is True, index of the candidate of each pair is also
+    returned
+    """
+
+    if candidates is None:
+        candidates = get_candidate_face_pairs(isl)
+    face_island = isl.face_island
+
+    # clip face belongs to the island whose index is smaller
+    face_pairs = candidates.copy()
+    swap = face_island[face_pairs[:, 0]] > face_island[face_pairs[:, 1]]
+    face_pairs[swap] = face_pairs[swap, ::-1]
+    order = np.lexsort((face_pairs[:, 1], face_pairs[:, 0],
+                        face_island[face_pairs[:, 1]],
+                        face_island[face_pairs[:, 0]]))
+
+    if return_index:
+        return face_pairs[order], order
+    return face_pairs[order]
+
 
+def clip_face_pair(isl, clip, subject, mode):
+    """
+    Clip the face pair in the island set
+    """
+
+    clip_xs, clip_ys = get_uv_polygon(isl, clip)
+    subject_xs, subject_ys = get_uv_polygon(isl, subject)
 
-def is_point_in_polygon(point, subject_points):
-    count = 0
-    for i in range(len(subject_points)):
-        uv_start1 = subject_points.get(i)
-        uv_end1 = subject_points.get(i + 1)
-        uv_start2 = point
-        uv_end2 = Vector((1000000.0, point.y))
-        intersected, _ = is_segment_intersect(uv_start1, uv_end1,
-                                              uv_start2, uv_end2)
-        if intersected:
-            count = count + 1
+    return do_triangle_cliping(clip_xs, clip_ys, subject_xs, subject_ys, mode)
 
-    return count % 2
 
+def get_overlapped_info(isl, clip, subject, polygons, area):
+    start = isl.face_start[subject]
+    subject_uvs = [Vector(uv) for uv
+                   in isl.uvs[start:start + isl.face_size[subject]].tolist()]
 
-def is_points_in_polygon(points, subject_points):
-    for i in range(len(points)):
-        internal = is_point_in_polygon(points.get(i), subject_points)
-        if not internal:
-            return False
+    return {"clip_face": isl.faces[clip],
+            "subject_face": isl.faces[subject],
+            "subject_uvs": subject_uvs,
+            "polygons": [[Vector(uv) for uv in poly] for poly in polygons],
+            "area": area}
 
-    return True
+
+def get_flipped_info(isl, fidx):
+    start = isl.face_start[fidx]
+    uvs = [Vector(uv) for uv
+           in isl.uvs[start:start + isl.face_size[fidx]].tolist()]
+
+    return {"face": isl.faces[fidx], "uvs": uvs,
+            "polygons": [[uv.copy() for uv in uvs]]}
+
+
+def get_flipped_faces(isl):
+    """
+    Get indices of faces whose UVs are flipped
+    """
+
+    # orientation of all faces are checked at once by signed area
+    areas = common.calc_polygon_2d_signed_areas(isl.uvs, isl.face_start,
+                                                isl.face_size)
+
+    return np.nonzero(areas < 0)[0]
 
 
 def get_overlapped_uv_info(bm, faces, uv_layer, mode):
-    # at first, check island overlapped
     isl = common.get_island_info_from_faces(bm, faces, uv_layer)
-    overlapped_isl_pairs = []
-    for i, i1 in enumerate(isl):
-        for i2 in isl[i + 1:]:
-            if (i1["max"].x < i2["min"].x) or (i2["max"].x < i1["min"].x) or \
-               (i1["max"].y < i2["min"].y) or (i2["max"].y < i1["min"].y):
-                continue
-            overlapped_isl_pairs.append([i1, i2])
 
-    # next, check polygon overlapped
     overlapped_uvs = []
-    for oip in overlapped_isl_pairs:
-        for clip in oip[0]["faces"]:
-            f_clip = clip["face"]
-            for subject in oip[1]["faces"]:
-                f_subject = subject["face"]
-
-                # fast operation, apply bounding box algorithm
-                if (clip["max_uv"].x < subject["min_uv"].x) or \
-                   (subject["max_uv"].x < clip["min_uv"].x) or \
-                   (clip["max_uv"].y < subject["min_uv"].y) or \
-                   (subject["max_uv"].y < clip["min_uv"].y):
-                    continue
-
-                # slow operation, apply Weiler-Atherton cliping algorithm
-                result, polygons = do_weiler_atherton_cliping(f_clip,
-                                                              f_subject,
-                                                              uv_layer, mode)
-                if result:
-                    subject_uvs = [l[uv_layer].uv.copy()
-                                   for l in f_subject.loops]
-                    overlapped_uvs.append({"clip_face": f_clip,
-                                           "subject_face": f_subject,
-                                           "subject_uvs": subject_uvs,
-                                           "polygons": polygons})
+    for clip, subject in get_overlapped_face_pairs(isl).tolist():
+        # slow operation, clip triangulated faces
+        result, polygons, area = clip_face_pair(isl, clip, subject, mode)
+        if result:
+            overlapped_uvs.append(
+                get_overlapped_info(isl, clip, subject, polygons, area))
 
     return overlapped_uvs
 
 
 def get_flipped_uv_info(faces, uv_layer):
-    flipped_uvs = []
-    for f in faces:
-        polygon = RingBuffer([l[uv_layer].uv.copy() for l in f.loops])
-        if is_polygon_flipped(polygon):
-            uvs = [l[uv_layer].uv.copy() for l in f.loops]
-            flipped_uvs.append({"face": f, "uvs": uvs,
-                                "polygons": [polygon.as_list()]})
+    isl = common.get_island_info_from_faces(None, faces, uv_layer)
 
-    return flipped_uvs
+    return [get_flipped_info(isl, fidx)
+            for fidx in get_flipped_faces(isl).tolist()]
 
 
-def update_uvinsp_info(context):
-    sc = context.scene
-    props = sc.muv_props.uvinsp
+def __get_face_triangles(isl):
+    """
+    Triangulate UV polygons of faces
+    Convex faces are triangulated as fan at once, and the other faces by
+    triangulate_polygon, so that concave face does not overlap itself
+    Returns (N, 3, 2) array of triangles and the face index of each one
+    """
 
+    # face is convex if no vertex turns against the winding of the face
+    start = np.repeat(isl.face_start, isl.face_size)
+    size = np.repeat(isl.face_size, isl.face_size)
+    offsets = np.cumsum(isl.face_size) - isl.face_size
+    pos = np.arange(len(start)) - np.repeat(offsets, isl.face_size)
+    cur = start + pos
+    prev = start + (pos - 1) % size
+    nxt = start + (pos + 1) % size
+    uvs = isl.uvs.astype(np.float64)
+    d1 = uvs[cur] - uvs[prev]
+    d2 = uvs[nxt] - uvs[cur]
+    areas = common.calc_polygon_2d_signed_areas(uvs, isl.face_start,
+                                                isl.face_size)
+    turns = (d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]) * \
+        np.repeat(np.sign(areas), isl.face_size)
+    convex = np.ones(len(isl.face_size), dtype=bool)
+    has_loops = isl.face_size > 0
+    convex[has_loops] = np.minimum.reduceat(
+        turns, offsets[has_loops]) >= 0.0
+
+    faces = np.nonzero(convex)[0]
+    tris = [get_triangle_fan_verts(uvs, isl.face_start[faces],
+                                   isl.face_size[faces]).reshape(-1, 3, 2)]
+    tri_face = [np.repeat(faces, np.maximum(isl.face_size[faces] - 2, 0))]
+    for fidx in np.nonzero(~convex)[0].tolist():
+        xs, ys = get_uv_polygon(isl, fidx)
+        face_tris = [[(xs[i], ys[i]) for i in tri]
+                     for tri in triangulate_polygon(xs, ys)]
+        tris.append(np.array(face_tris, dtype=np.float32).reshape(-1, 3, 2))
+        tri_face.append(np.full(len(face_tris), fidx, dtype=np.int64))
+
+    return np.concatenate(tris), np.concatenate(tri_face)
+
+
+def __get_triangle_spans(tris, resolution):
+    """
+    Scan-convert triangles given in texel space into horizontal spans
+    Texel is covered if its center is inside the triangle, and the center on
+    the edge is covered by only one triangle (top-left rule).
+    Returns (triangle index, row, first column, end column) of each span
+    """
+
+    # make all triangles counter-clockwise, skip degenerated triangles
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - \
+        (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    tris = tris.copy()
+    tris[area < 0, 1], tris[area < 0, 2] = c[area < 0], b[area < 0]
+    valid = np.nonzero(area != 0)[0]
+    tris = tris[valid]
+
+    # rows whose center is in the bounding box
+    lo = np.clip(np.ceil(tris[:, :, 1].min(axis=1) - 0.5), 0, resolution)
+    hi = np.clip(np.floor(tris[:, :, 1].max(axis=1) - 0.5), -1,
+                 resolution - 1)
+    height = np.maximum(hi - lo + 1, 0).astype(np.int64)
+    tri = np.repeat(np.arange(len(tris)), height)
+    row = np.repeat(lo.astype(np.int64), height) + np.arange(len(tri)) - \
+        np.repeat(np.cumsum(height) - height, height)
+    py = row + 0.5
+
+    # center is inside if it is right of the downward edges (inclusive),
+    # left of the upward edges (exclusive) and below the top edge (inclusive)
+    # or above the bottom edge (exclusive)
+    left = np.full(len(tri), -np.inf)
+    right = np.full(len(tri), np.inf)
+    inside = np.ones(len(tri), dtype=bool)
+    for i in range(3):
+        p1 = tris[tri, i]
+        p2 = tris[tri, (i + 1) % 3]
+        dx = p2[:, 0] - p1[:, 0]
+        dy = p2[:, 1] - p1[:, 1]
+        # shared edge must give the same x in both triangles
+        low = np.where((dy > 0)[:, np.newaxis], p1, p2)
+        high = np.where((dy > 0)[:, np.newaxis], p2, p1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = low[:, 0] + (py - low[:, 1]) * (high[:, 0] - low[:, 0]) / \
+                (high[:, 1] - low[:, 1])
+        left = np.where(dy < 0, np.maximum(left, x), left)
+        right = np.where(dy > 0, np.minimum(right, x), right)
+        inside &= ~((dy == 0) & (dx < 0) & (py > p1[:, 1]))
+        inside &= ~((dy == 0) & (dx > 0) & (py <= p1[:, 1]))
+
+    first = np.clip(np.ceil(left - 0.5), 0, resolution).astype(np.int64)
+    end = np.clip(np.ceil(right - 0.5), 0, resolution).astype(np.int64)
+    inside &= first < end
+
+    return valid[tri[inside]], row[inside], first[inside], end[inside]
+
+
+def get_uv_coverage(isl, resolution):
+    """
+    Get coverage of UVs at texel resolution
+    Faces are triangulated, and the number of triangles which cover each
+    texel is counted in the integer buffer. Texels covered more than once
+    are overlapped. Texels outside [0, 1] are not counted.
+    Returns (coverage buffer, overlapped texels of each face)
+    """
+
+    num_faces = len(isl.face_size)
+    tris, tri_face = __get_face_triangles(isl)
+    tris = tris.astype(np.float64) * resolution
+    tri, row, first, end = __get_triangle_spans(tris, resolution)
+
+    # accumulate spans by the difference of coverage along each row
+    width = resolution + 1
+    diff = np.zeros((resolution, width), dtype=np.int32)
+    flat = diff.reshape(-1)
+    idx, counts = np.unique(row * width + first, return_counts=True)
+    flat[idx] += counts.astype(np.int32)
+    idx, counts = np.unique(row * width + end, return_counts=True)
+    flat[idx] -= counts.astype(np.int32)
+    coverage = np.cumsum(diff, axis=1, out=diff)[:, :resolution]
+
+    # count overlapped texels in each span by prefix sum along each row
+    overlapped = np.zeros((resolution, width), dtype=np.int32)
+    np.cumsum(coverage > 1, axis=1, out=overlapped[:, 1:])
+    counts = overlapped[row, end] - overlapped[row, first]
+    face_overlapped = np.bincount(tri_face[tri], weights=counts,
+                                  minlength=num_faces).astype(np.int64)
+
+    return coverage, face_overlapped
+
+
+class UVInspResult:
+    """
+    Overlapped/Flipped UVs found by the inspection
+    Faces are stored as the index in the island set, and UV polygons are
+    computed from the island set only when they are requested. BMFace is not
+    referred, so results are still safe after the mesh is edited
+     - overlapped: (clip, subject) face pairs
+     - overlapped_area: area of the overlapped region of each pair
+     - flipped: faces whose UVs are flipped
+     - face_indices: index of BMFace of each face in the island set
+    """
+
+    def __init__(self, isl, face_indices):
+        self.isl = isl.bind([])
+        self.face_indices = face_indices
+        self.overlapped = np.empty((0, 2), dtype=np.int64)
+        self.overlapped_area = np.empty(0, dtype=np.float64)
+        self.flipped = np.empty(0, dtype=np.int64)
+
+    def add(self, overlapped, flipped):
+        """
+        Add results
+        overlapped: list of (clip, subject, area)
+        flipped: list of face index
+        """
+
+        if overlapped:
+            pairs = np.array([(c, s) for c, s, _ in overlapped],
+                             dtype=np.int64)
+            areas = np.array([a for _, _, a in overlapped],
+                             dtype=np.float64)
+            self.overlapped = np.concatenate((self.overlapped, pairs))
+            self.overlapped_area = np.concatenate((self.overlapped_area,
+                                                   areas))
+        if flipped:
+            self.flipped = np.concatenate(
+                (self.flipped, np.array(flipped, dtype=np.int64)))
+
+    def __get_face_uvs(self, fidx):
+        start = self.isl.face_start[fidx]
+        return self.isl.uvs[start:start + self.isl.face_size[fidx]].tolist()
+
+    def get_overlapped_polygons(self, i, mode):
+        """
+        Get overlapped polygons of i-th pair as the list of (x, y)
+        PART: clipped polygons, FACE: UVs of subject face
+        """
+
+        clip, subject = self.overlapped[i].tolist()
+        if mode == 'FACE':
+            return [self.__get_face_uvs(subject)]
+        result, polygons, _ = clip_face_pair(self.isl, clip, subject, 'PART')
+
+        return polygons if result else []
+
+    def get_flipped_polygons(self, i):
+        return [self.__get_face_uvs(self.flipped[i])]
+
+
+class UVInspSnapshot:
+    """
+    UVs and results of the completed inspection
+    Results are reused by the next inspection for the faces whose UVs are not
+    moved from this snapshot
+     - key: (object, mesh, UV layer) which the results belong to
+     - face_indices: index of BMFace in the island set
+     - candidates: face pairs (i < j) found by broadphase
+     - areas: overlapped area of each candidate, NaN if not overlapped
+     - result: UVInspResult of the inspection
+    """
+
+    def __init__(self, key, isl, face_indices, candidates, areas):
+        self.key = key
+        self.isl = isl
+        self.face_indices = face_indices
+        self.candidates = candidates
+        self.areas = areas
+        self.result = None
+
+
+def get_moved_faces(snapshot, key, isl, face_indices):
+    """
+    Get faces whose UVs are moved from the snapshot
+    None is returned if the snapshot can not be used (ex. topology is changed)
+    """
+
+    if snapshot is None or snapshot.key != key:
+        return None
+    old = snapshot.isl
+    if (not np.array_equal(snapshot.face_indices, face_indices)
+            or not np.array_equal(old.face_size, isl.face_size)):
+        return None
+    if len(isl.face_size) == 0:
+        return np.zeros(0, dtype=bool)
+
+    moved_loops = np.any(old.uvs != isl.uvs, axis=1)
+    moved = np.logical_or.reduceat(moved_loops, isl.face_start)
+
+    # shared UV vertices among the faces not moved must be the same,
+    # otherwise mesh vertices are changed
+    kept = ~np.repeat(moved, isl.face_size)
+    old_ids = old.loop_uv_vert[kept]
+    new_ids = isl.loop_uv_vert[kept]
+    num_ids = len(np.unique(old_ids))
+    if (len(np.unique(new_ids)) != num_ids or
+            len(np.unique(old_ids * len(kept) + new_ids)) != num_ids):
+        return None
+
+    return moved
+
+
+class UVInspWorker:
+    """
+    Analyze overlapped/flipped UVs of the island set in the background thread.
+    Only the flat arrays of the island set are accessed from the thread, and
+    the results are accumulated per batch until pop_results() is called.
+    If the snapshot and faces moved from it are given, face pairs which do
+    not include the moved faces reuse the results of the snapshot.
+    Overlapped area is always measured, so the results do not depend on the
+    show mode
+    """
+
+    def __init__(self, isl, batch_size=256, key=None, face_indices=None,
+                 snapshot=None, moved=None):
+        self.isl = isl
+        self.num_pairs = 0
+        self.num_done = 0
+        self.snapshot = None
+        self.result = UVInspResult(isl, face_indices)
+        self.__batch_size = batch_size
+        self.__key = key
+        self.__face_indices = face_indices
+        self.moved = moved
+        self.__prev = snapshot if moved is not None else None
+        self.__overlapped = []
+        self.__flipped = []
+        self.__lock = threading.Lock()
+        self.__cancel = threading.Event()
+        self.__thread = threading.Thread(target=self.run)
+        self.__thread.daemon = True
+
+    def start(self):
+        self.__thread.start()
+
+    def cancel(self):
+        self.__cancel.set()
+
+    def is_running(self):
+        return self.__thread.is_alive()
+
+    def is_canceled(self):
+        return self.__cancel.is_set()
+
+    def pop_results(self):
+        """
+        Get (overlapped, flipped) results found since the last call
+        overlapped: list of (clip, subject, area)
+        flipped: list of face index
+        """
+
+        with self.__lock:
+            overlapped = self.__overlapped
+            flipped = self.__flipped
+            self.__overlapped = []
+            self.__flipped = []
+
+        return overlapped, flipped
+
+    def run(self):
+        """
+        Analyze UVs, called in the background thread by start()
+        """
+
+        # orientation of all faces are checked at once, it is cheap enough
+        flipped = get_flipped_faces(self.isl).tolist()
+        with self.__lock:
+            self.__flipped.extend(flipped)
+
+        # kept candidates come first, and reuse the areas of the snapshot
+        prev_areas = np.empty(0)
+        if self.__prev is None:
+            candidates = get_candidate_face_pairs(self.isl)
+        else:
+            prev = self.__prev
+            candidates = get_candidate_face_pairs(
+                self.isl, self.moved, prev.candidates)
+            prev_areas = prev.areas[
+                get_kept_candidates(self.moved, prev.candidates)]
+        pairs, index = get_overlapped_face_pairs(self.isl, candidates,
+                                                 return_index=True)
+        pairs = pairs.tolist()
+        index = index.tolist()
+        num_kept = len(prev_areas)
+        prev_areas = prev_areas.tolist()
+        self.num_pairs = len(pairs)
+        areas = np.full(len(candidates), np.nan)
+        for start in range(0, len(pairs), self.__batch_size):
+            if self.__cancel.is_set():
+                return
+            overlapped = []
+            for (clip, subject), i in zip(
+                    pairs[start:start + self.__batch_size],
+                    index[start:start + self.__batch_size]):
+                if i < num_kept:
+                    area = prev_areas[i]
+                else:
+                    # slow operation, clip triangulated faces
+                    result, _, area = clip_face_pair(self.isl, clip,
+                                                     subject, 'PART')
+                    if not result:
+                        area = np.nan
+                areas[i] = area
+                if not np.isnan(area):
+                    overlapped.append((clip, subject, area))
+            with self.__lock:
+                self.__overlapped.extend(overlapped)
+                self.num_done = min(start + self.__batch_size,
+                                    self.num_pairs)
+
+        self.snapshot = UVInspSnapshot(self.__key, self.isl,
+                                       self.__face_indices, candidates,
+                                       areas)
+
+
+def get_uvinsp_target_faces(context):
     obj = context.active_object
     bm = bmesh.from_edit_mesh(obj.data)
+    # faces are identified by index in the results, so indices must be valid
+    bm.faces.index_update()
     if common.check_version(2, 73, 0) >= 0:
         bm.faces.ensure_lookup_table()
     uv_layer = bm.loops.layers.uv.verify()
@@ -499,14 +893,100 @@ def update_uvinsp_info(context):
         sel_faces = [f for f in bm.faces]
     else:
         sel_faces = [f for f in bm.faces if f.select]
-    props.overlapped_info = get_overlapped_uv_info(bm, sel_faces, uv_layer,
-                                                   sc.muv_uvinsp_show_mode)
-    props.flipped_info = get_flipped_uv_info(sel_faces, uv_layer)
+
+    return bm, uv_layer, sel_faces
+
+
+def create_uvinsp_worker(context):
+    """
+    Snapshot UVs and find faces moved from the last inspection
+    """
+
+    props = context.scene.muv_props.uvinsp
+    obj = context.active_object
+
+    bm, uv_layer, sel_faces = get_uvinsp_target_faces(context)
+    isl = common.get_island_info_from_faces(bm, sel_faces, uv_layer,
+                                            obj.data)
+    key = (obj.name, obj.data.name, uv_layer.name)
+    face_indices = np.array([f.index for f in sel_faces], dtype=np.int64)
+    moved = get_moved_faces(props.snapshot, key, isl, face_indices)
+    if moved is not None:
+        common.debug_print("UV Inspection: {} faces are moved".format(
+            int(moved.sum())))
+
+    return UVInspWorker(isl, key=key, face_indices=face_indices,
+                        snapshot=props.snapshot, moved=moved)
+
+
+def update_uvinsp_info(context):
+    props = context.scene.muv_props.uvinsp
+
+    stop_uvinsp_worker(context)
+    props.result = get_uvinsp_result(context)
+
+
+def start_uvinsp_worker(context):
+    """
+    Snapshot UVs and start to analyze them in the background
+    """
+
+    props = context.scene.muv_props.uvinsp
+
+    stop_uvinsp_worker(context)
+    props.worker = create_uvinsp_worker(context)
+    props.result = props.worker.result
+    props.worker.start()
+
+    return props.worker
+
+
+def stop_uvinsp_worker(context):
+    props = context.scene.muv_props.uvinsp
+    if props.worker is not None:
+        props.worker.cancel()
+        props.worker = None
+
+
+def fetch_uvinsp_worker_results(context):
+    props = context.scene.muv_props.uvinsp
+    worker = props.worker
+    worker.result.add(*worker.pop_results())
+    if not worker.is_running() and worker.snapshot is not None:
+        worker.snapshot.result = worker.result
+        props.snapshot = worker.snapshot
+
+
+def get_uvinsp_result(context):
+    """
+    Get the inspection result of the current UVs
+    Result of the last completed inspection is reused if UVs are not changed
+    from it, otherwise only the moved faces are inspected again
+    """
+
+    props = context.scene.muv_props.uvinsp
+
+    worker = create_uvinsp_worker(context)
+    snapshot = props.snapshot
+    if (worker.moved is not None and not worker.moved.any()
+            and snapshot.result is not None):
+        return snapshot.result
+
+    stop_uvinsp_worker(context)
+    worker.run()
+    props.result = worker.result
+    props.worker = worker
+    fetch_uvinsp_worker_results(context)
+    props.worker = None
+
+    return worker.result
 
 
 class MUV_UVInspUpdate(bpy.types.Operator):
     """
     Operation class: Update
+    Overlapped/Flipped UVs are analyzed in the background, and the results
+    are shown progressively. Press ESC to cancel
     """
 
     bl_idname = "uv.muv_uvinsp_update"
@@ -514,7 +994,63 @@ class MUV_UVInspUpdate(bpy.types.Operator):
     bl_description = "Update Overlapped/Flipped UV"
     bl_options = {'REGISTER', 'UNDO'}
 
+    def __init__(self):
+        self.__timer = None
+        self.__worker = None
+
+    def __handle_add(self, context):
+        if self.__timer is None:
+            self.__timer = context.window_manager.event_timer_add(
+                0.10, context.window)
+            context.window_manager.modal_handler_add(self)
+
+    def __handle_remove(self, context):
+        if self.__timer is not None:
+            context.window_manager.event_timer_remove(self.__timer)
+            self.__timer = None
+
+    def modal(self, context, event):
+        props = context.scene.muv_props.uvinsp
+
+        # analysis is canceled or restarted
+        if props.worker is not self.__worker:
+            self.__handle_remove(context)
+            return {'CANCELLED'}
+
+        if event.type == 'ESC':
+            stop_uvinsp_worker(context)
+            self.__handle_remove(context)
+            if context.area:
+                context.area.tag_redraw()
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            running = self.__worker.is_running()
+            fetch_uvinsp_worker_results(context)
+            if context.area:
+                context.area.tag_redraw()
+            if not running:
+                props.worker = None
+                self.__handle_remove(context)
+                return {'FINISHED'}
+
+        return {'PASS_THROUGH'}
+
+    def invoke(self, context, _):
+        # no window to receive timer events (ex. background mode)
+        if context.window is None:
+            return self.execute(context)
+
+        self.__worker = start_uvinsp_worker(context)
+        self.__handle_add(context)
+
+        if context.area:
+            context.area.tag_redraw()
+
+        return {'RUNNING_MODAL'}
+
     def execute(self, context):
+        stop_uvinsp_worker(context)
         update_uvinsp_info(context)
 
         if context.area:
@@ -537,10 +1073,11 @@ class MUV_UVInspDisplay(bpy.types.Operator):
         sc = context.scene
         props = sc.muv_props.uvinsp
         if not props.display_running:
-            update_uvinsp_info(context)
             MUV_UVInspRenderer.handle_add(self, context)
             props.display_running = True
+            bpy.ops.uv.muv_uvinsp_update('INVOKE_DEFAULT')
         else:
+            stop_uvinsp_worker(context)
             MUV_UVInspRenderer.handle_remove()
             props.display_running = False
 
@@ -562,24 +1099,18 @@ class MUV_UVInspSelectOverlapped(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.active_object
-        bm = bmesh.from_edit_mesh(obj.data)
-        if common.check_version(2, 73, 0) >= 0:
-            bm.faces.ensure_lookup_table()
-        uv_layer = bm.loops.layers.uv.verify()
-
-        if context.tool_settings.use_uv_select_sync:
-            sel_faces = [f for f in bm.faces]
-        else:
-            sel_faces = [f for f in bm.faces if f.select]
+        bm, uv_layer, _ = get_uvinsp_target_faces(context)
 
-        overlapped_info = get_overlapped_uv_info(bm, sel_faces, uv_layer,
-                                                 'FACE')
+        # result of UV Inspection is reused if UVs are not changed
+        result = get_uvinsp_result(context)
+        subjects = result.face_indices[result.overlapped[:, 1]]
 
-        for info in overlapped_info:
+        for fidx in subjects.tolist():
+            face = bm.faces[fidx]
             if context.tool_settings.use_uv_select_sync:
-                info["subject_face"].select = True
+                face.select = True
             else:
-                for l in info["subject_face"].loops:
+                for l in face.loops:
                     l[uv_layer].select = True
 
         bmesh.update_edit_mesh(obj.data)
@@ -599,25 +1130,69 @@ class MUV_UVInspSelectFlipped(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.active_object
-        bm = bmesh.from_edit_mesh(obj.data)
-        if common.check_version(2, 73, 0) >= 0:
-            bm.faces.ensure_lookup_table()
-        uv_layer = bm.loops.layers.uv.verify()
-
-        if context.tool_settings.use_uv_select_sync:
-            sel_faces = [f for f in bm.faces]
-        else:
-            sel_faces = [f for f in bm.faces if f.select]
+        bm, uv_layer, _ = get_uvinsp_target_faces(context)
 
-        flipped_info = get_flipped_uv_info(sel_faces, uv_layer)
+        # result of UV Inspection is reused if UVs are not changed
+        result = get_uvinsp_result(context)
+        flipped = result.face_indices[result.flipped]
 
-        for info in flipped_info:
+        for fidx in flipped.tolist():
+            face = bm.faces[fidx]
             if context.tool_settings.use_uv_select_sync:
-                info["face"].select = True
+                face.select = True
             else:
-                for l in info["face"].loops:
+                for l in face.loops:
                     l[uv_layer].select = True
 
         bmesh.update_edit_mesh(obj.data)
 
         return {'FINISHED'}
+
+
+class MUV_UVInspCoverage(bpy.types.Operator):
+    """
+    Operation class: Find overlapped UVs at texel resolution
+    """
+
+    bl_idname = "uv.muv_uvinsp_coverage"
+    bl_label = "Coverage"
+    bl_description = "Find overlapped UVs at texel resolution"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    resolution = IntProperty(
+        name="Resolution",
+        description="Number of texels along each side of the texture",
+        default=1024,
+        min=16,
+        max=8192
+    )
+
+    def execute(self, context):
+        props = context.scene.muv_props.uvinsp
+
+        bm, uv_layer, sel_faces = get_uvinsp_target_faces(context)
+        isl = common.get_island_info_from_faces(bm, sel_faces, uv_layer,
+                                                context.active_object.data)
+        coverage, face_overlapped = get_uv_coverage(isl, self.resolution)
+
+        num_covered = int(np.count_nonzero(coverage))
+        num_overlapped = int(np.count_nonzero(coverage > 1))
+        ratio = num_overlapped * 100.0 / num_covered if num_covered else 0.0
+        overlapped_faces = np.nonzero(face_overlapped)[0].tolist()
+        props.coverage_info = {
+            "resolution": self.resolution,
+            "covered": num_covered,
+            "overlapped": num_overlapped,
+            "ratio": ratio,
+            "faces": [(sel_faces[i].index, int(face_overlapped[i]))
+                      for i in overlapped_faces],
+        }
+
+        self.report({'INFO'}, "{0} texels ({1:.2f}%) are overlapped in {2} "
+                    "faces".format(num_overlapped, ratio,
+                                   len(overlapped_faces)))
+
+        if context.area:
+            context.area.tag_redraw()
+
+        return {'FINISHED'}
@@ -26,6 +26,7 @@ __date__ = "24 Feb 2018"
 from bpy.props import (
     FloatProperty,
     FloatVectorProperty,
+    StringProperty,
 )
 from bpy.types import AddonPreferences
 
@@ -68,6 +69,15 @@ class MUV_Preferences(AddonPreferences):
         subtype='COLOR'
     )
 
+    # for Copy/Paste UV
+    cpuv_clipboard_dir = StringProperty(
+        name="Clipboard Directory",
+        description="Directory to share copied UV among Blender sessions"
+                    " (user data directory if empty)",
+        default="",
+        subtype='DIR_PATH'
+    )
+
     # for Texture Projection
     texproj_canvas_padding = FloatVectorProperty(
         name="Canvas Padding",
@@ -120,6 +130,15 @@ class MUV_Preferences(AddonPreferences):
 
         layout.separator()
 
+        layout.label("Copy/Paste UV:")
+        sp = layout.split(percentage=0.05)
+        col = sp.column()       # spacer
+        sp = sp.split(percentage=0.6)
+        col = sp.column()
+        col.prop(self, "cpuv_clipboard_dir")
+
+        layout.separator()
+
         layout.label("Texture Projection:")
         sp = layout.split(percentage=0.05)
         col = sp.column()       # spacer
@@ -71,15 +71,11 @@ class MUV_Properties():
 
 
 class MUV_CPUVProps():
-    src_uvs = []
-    src_pin_uvs = []
-    src_seams = []
+    clipboard = None
 
 
 class MUV_CPUVSelSeqProps():
-    src_uvs = []
-    src_pin_uvs = []
-    src_seams = []
+    clipboard = None
 
 
 class MUV_TransUVProps():
@@ -114,8 +110,10 @@ class MUV_MVUVProps():
 
 class MUV_UVInspProps():
     display_running = False
-    overlapped_info = []
-    flipped_info = []
+    result = None
+    worker = None
+    snapshot = None
+    coverage_info = None
 
 
 class MUV_UVSculptProps():
@@ -222,6 +220,13 @@ def init_props(scene):
         ],
         default='PART'
     )
+    scene.muv_uvinsp_coverage_resolution = IntProperty(
+        name="Resolution",
+        description="Number of texels along each side of the texture",
+        default=1024,
+        min=16,
+        max=8192
+    )
 
     # Align UV
     scene.muv_auv_enabled = BoolProperty(
@@ -239,6 +244,11 @@ def init_props(scene):
         description="Select UVs which are aligned",
         default=False
     )
+    scene.muv_auv_multiple = BoolProperty(
+        name="Multiple",
+        description="Align all selected UV loop sequences",
+        default=False
+    )
     scene.muv_auv_vertical = BoolProperty(
         name="Vert-Infl (Vertical)",
         description="Align vertical direction influenced "
@@ -286,6 +296,19 @@ def init_props(scene):
         default=False
     )
 
+    scene.muv_smuv_multiple = BoolProperty(
+        name="Multiple",
+        description="Smooth all selected UV loop sequences",
+        default=False
+    )
+    scene.muv_smuv_iterations = IntProperty(
+        name="Iterations",
+        description="Number of times to smooth",
+        min=1,
+        max=100,
+        default=1
+    )
+
     # UV Bounding Box
     scene.muv_uvbb_enabled = BoolProperty(
         name="UV Bounding Box Enabled",
@@ -672,11 +695,13 @@ def clear_props(scene):
     del scene.muv_uvinsp_show_overlapped
     del scene.muv_uvinsp_show_flipped
     del scene.muv_uvinsp_show_mode
+    del scene.muv_uvinsp_coverage_resolution
 
     # Align UV
     del scene.muv_auv_enabled
     del scene.muv_auv_transmission
     del scene.muv_auv_select
+    del scene.muv_auv_multiple
     del scene.muv_auv_vertical
     del scene.muv_auv_horizontal
     del scene.muv_auv_location
@@ -686,6 +711,8 @@ def clear_props(scene):
     del scene.muv_smuv_transmission
     del scene.muv_smuv_mesh_infl
     del scene.muv_smuv_select
+    del scene.muv_smuv_multiple
+    del scene.muv_smuv_iterations
 
     # UV Bounding Box
     del scene.muv_uvbb_enabled
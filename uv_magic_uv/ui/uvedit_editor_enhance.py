@@ -129,8 +129,22 @@ class IMAGE_PT_MUV_EE(bpy.types.Panel):
                              text="Hide", icon='PAUSE')
                 row.operator(uv_inspection.MUV_UVInspUpdate.bl_idname,
                              text="Update")
+            worker = sc.muv_props.uvinsp.worker
+            if worker is not None:
+                box.label("Analyzing... {0}/{1} (ESC to cancel)".format(
+                    worker.num_done, worker.num_pairs))
             row = box.row()
             row.prop(sc, "muv_uvinsp_show_overlapped")
             row.prop(sc, "muv_uvinsp_show_flipped")
             row = box.row()
             row.prop(sc, "muv_uvinsp_show_mode")
+            row = box.row()
+            ops = row.operator(uv_inspection.MUV_UVInspCoverage.bl_idname,
+                               text="Coverage")
+            ops.resolution = sc.muv_uvinsp_coverage_resolution
+            row.prop(sc, "muv_uvinsp_coverage_resolution")
+            info = sc.muv_props.uvinsp.coverage_info
+            if info is not None:
+                box.label("Overlapped: {0} texels ({1:.2f}%) / {2} faces"
+                          .format(info["overlapped"], info["ratio"],
+                                  len(info["faces"])))
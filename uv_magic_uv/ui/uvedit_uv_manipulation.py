@@ -59,16 +59,19 @@ class IMAGE_PT_MUV_UVManip(bpy.types.Panel):
             ops = row.operator(align_uv.MUV_AUVCircle.bl_idname, text="Circle")
             ops.transmission = sc.muv_auv_transmission
             ops.select = sc.muv_auv_select
+            ops.multiple = sc.muv_auv_multiple
             ops = row.operator(align_uv.MUV_AUVStraighten.bl_idname,
                                text="Straighten")
             ops.transmission = sc.muv_auv_transmission
             ops.select = sc.muv_auv_select
+            ops.multiple = sc.muv_auv_multiple
             ops.vertical = sc.muv_auv_vertical
             ops.horizontal = sc.muv_auv_horizontal
             row = col.row()
             ops = row.operator(align_uv.MUV_AUVAxis.bl_idname, text="XY-axis")
             ops.transmission = sc.muv_auv_transmission
             ops.select = sc.muv_auv_select
+            ops.multiple = sc.muv_auv_multiple
             ops.vertical = sc.muv_auv_vertical
             ops.horizontal = sc.muv_auv_horizontal
             ops.location = sc.muv_auv_location
@@ -78,6 +81,7 @@ class IMAGE_PT_MUV_UVManip(bpy.types.Panel):
             row = col.row(align=True)
             row.prop(sc, "muv_auv_transmission", text="Transmission")
             row.prop(sc, "muv_auv_select", text="Select")
+            row.prop(sc, "muv_auv_multiple", text="Multiple")
             row = col.row(align=True)
             row.prop(sc, "muv_auv_vertical", text="Vertical")
             row.prop(sc, "muv_auv_horizontal", text="Horizontal")
@@ -90,11 +94,15 @@ class IMAGE_PT_MUV_UVManip(bpy.types.Panel):
             ops.transmission = sc.muv_smuv_transmission
             ops.select = sc.muv_smuv_select
             ops.mesh_infl = sc.muv_smuv_mesh_infl
+            ops.multiple = sc.muv_smuv_multiple
+            ops.iterations = sc.muv_smuv_iterations
             col = box.column(align=True)
             row = col.row(align=True)
             row.prop(sc, "muv_smuv_transmission", text="Transmission")
             row.prop(sc, "muv_smuv_select", text="Select")
+            row.prop(sc, "muv_smuv_multiple", text="Multiple")
             col.prop(sc, "muv_smuv_mesh_infl", text="Mesh Influence")
+            col.prop(sc, "muv_smuv_iterations", text="Iterations")
 
         box = layout.box()
         box.prop(sc, "muv_seluv_enabled", text="Select UV")